@@ -0,0 +1,267 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import game
+
+DEFAULT_THRESHOLD = 10.0  # percent slower than the baseline before a run fails
+GAME_PIECES = 100
+
+
+class NullSink:
+    # Stands in for the terminal so draw() pays for building and diffing frames, not for I/O.
+    def __init__(self):
+        self.written = 0
+
+    def write(self, text):
+        self.written += len(text)
+
+    def flush(self):
+        pass
+
+
+OPTIONS = dict(game.DEFAULT_OPTIONS)
+
+
+def _new_game(engine, seed=1):
+    return game.Tetris(OPTIONS, engine=engine, persist=False, seed=seed)
+
+
+def _midgame(engine):
+    # A mid-game board with some stack and holes, reached the same way on every run.
+    tetris = _new_game(engine)
+    policy = game.Autoplayer(seed=1)
+    while tetris.pieces_placed < 12:
+        for action in policy(tetris):
+            game.apply_action(tetris, action)
+    return tetris
+
+
+def _timed_calls(count, prepare, call):
+    # For operations that change the game: prepare() restores the state and is not timed.
+    total = 0.0
+    for _ in range(count):
+        prepare()
+        started = time.perf_counter()
+        call()
+        total += time.perf_counter() - started
+    return total
+
+
+def bench_check_collision(engine, count):
+    tetris = _midgame(engine)
+    check = tetris.check_collision
+    offsets = [(dx, dy, rot) for dx in (-2, -1, 0, 1, 2) for dy in (0, 1, 4, 8) for rot in range(4)]
+    rounds = max(1, count // len(offsets))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for dx, dy, rot in offsets:
+            check(dx, dy, rot)
+    return rounds * len(offsets), time.perf_counter() - started
+
+
+def bench_rotate(engine, count):
+    tetris = _midgame(engine)
+    rotate = tetris.rotate
+    started = time.perf_counter()
+    for _ in range(count):
+        rotate()
+    return count, time.perf_counter() - started
+
+
+def bench_hard_drop(engine, count):
+    tetris = _midgame(engine)
+    snapshot = tetris.snapshot()
+    return count, _timed_calls(count, lambda: tetris.restore(snapshot), tetris.hard_drop)
+
+
+def bench_clear_lines(engine, count):
+    tetris = _midgame(engine)
+    rows = tetris.board_rows()
+    rows[-4:] = [tetris.full_mask] * 4
+    tetris._load_rows(rows)
+    snapshot = tetris.snapshot()
+    touched = list(range(tetris.height - 4, tetris.height))
+    return count, _timed_calls(count, lambda: tetris.restore(snapshot), lambda: tetris.clear_lines(touched))
+
+
+def bench_apply_scoring(engine, count):
+    tetris = _new_game(engine)
+    apply_scoring = tetris.apply_scoring
+    started = time.perf_counter()
+    for i in range(count):
+        apply_scoring(i % 5, t_spin=i % 7 == 0)
+    return count, time.perf_counter() - started
+
+
+def bench_draw(engine, count):
+    # Alternates the piece one column left and right, so every frame carries a small diff.
+    tetris = _midgame(engine)
+    tetris.renderer = game.DiffRenderer(stream=NullSink())
+    started = time.perf_counter()
+    for i in range(count):
+        tetris.x += 1 if i % 2 else -1
+        tetris.draw()
+    return count, time.perf_counter() - started
+
+
+def bench_draw_full(engine, count):
+    tetris = _midgame(engine)
+    tetris.renderer = game.DiffRenderer(stream=NullSink())
+    started = time.perf_counter()
+    for _ in range(count):
+        tetris.renderer.invalidate()
+        tetris.draw()
+    return count, time.perf_counter() - started
+
+
+def bench_headless_random(engine, count):
+    started = time.perf_counter()
+    for seed in range(count):
+        game.run_headless(
+            OPTIONS,
+            game.PolicyInput(game.RandomPolicy(seed)),
+            engine=engine,
+            max_pieces=GAME_PIECES,
+            seed=seed,
+        )
+    return count, time.perf_counter() - started
+
+
+def bench_headless_autoplay(engine, count):
+    started = time.perf_counter()
+    for seed in range(count):
+        game.run_headless(
+            OPTIONS,
+            game.PolicyInput(game.Autoplayer(seed)),
+            engine=engine,
+            max_pieces=GAME_PIECES,
+            seed=seed,
+        )
+    return count, time.perf_counter() - started
+
+
+# name -> (function, operations per repeat, unit)
+BENCHMARKS = {
+    "check_collision": (bench_check_collision, 20000, "ops"),
+    "rotate": (bench_rotate, 20000, "ops"),
+    "hard_drop": (bench_hard_drop, 5000, "ops"),
+    "clear_lines": (bench_clear_lines, 5000, "ops"),
+    "apply_scoring": (bench_apply_scoring, 20000, "ops"),
+    "draw": (bench_draw, 2000, "ops"),
+    "draw_full": (bench_draw_full, 1000, "ops"),
+    "headless_random": (bench_headless_random, 5, "games"),
+    "headless_autoplay": (bench_headless_autoplay, 2, "games"),
+}
+
+
+def run_benchmarks(names, engines, repeat=5, scale=1.0):
+    # Best of `repeat` runs, reported as operations (or games) per second.
+    results = {}
+    for engine in engines:
+        for name in names:
+            function, count, unit = BENCHMARKS[name]
+            count = max(1, int(count * scale))
+            best = None
+            for _ in range(repeat):
+                ops, seconds = function(engine, count)
+                rate = ops / seconds if seconds > 0 else float("inf")
+                best = rate if best is None else max(best, rate)
+            results[f"{engine}.{name}"] = {"rate": best, "unit": unit}
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Returns (key, baseline rate, current rate, percent slower) for every regression past threshold.
+    regressions = []
+    for key, entry in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        slower = (previous["rate"] - entry["rate"]) / previous["rate"] * 100
+        if slower > threshold:
+            regressions.append((key, previous["rate"], entry["rate"], slower))
+    return regressions
+
+
+def load_baseline(path):
+    # Returns (ruleset, results); baselines saved before rulesets existed are "standard".
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return payload.get("ruleset", "standard"), payload["results"]
+
+
+def save_baseline(path, results, ruleset="standard"):
+    payload = {
+        "python": sys.version.split()[0],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "ruleset": ruleset,
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris84 engine benchmarks")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="NAME",
+        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--engine", choices=sorted(game.ENGINES) + ["all"], default="all", help="board engine")
+    parser.add_argument("--ruleset", choices=sorted(game.RULESETS), default="standard", help="board size, pieces and scoring")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark; the best one counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the work per run (use <1 for a quick check)")
+    parser.add_argument("--save", default=None, metavar="PATH", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", default=None, metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"allowed slowdown against the baseline in percent (default: {DEFAULT_THRESHOLD:g})",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    OPTIONS["ruleset"] = args.ruleset
+    names = args.names or list(BENCHMARKS)
+    engines = sorted(game.ENGINES) if args.engine == "all" else [args.engine]
+    baseline = {}
+    if args.compare:
+        baseline_ruleset, baseline = load_baseline(args.compare)
+        if baseline_ruleset != args.ruleset:
+            print(
+                f"{args.compare} was recorded with --ruleset {baseline_ruleset}, not {args.ruleset}",
+                file=sys.stderr,
+            )
+            return 2
+
+    results = run_benchmarks(names, engines, repeat=args.repeat, scale=args.scale)
+    for key, entry in results.items():
+        line = f"{key:<32} {entry['rate']:>14,.1f} {entry['unit']}/s"
+        if key in baseline:
+            change = (entry["rate"] - baseline[key]["rate"]) / baseline[key]["rate"] * 100
+            line += f"  ({change:+.1f}% vs baseline)"
+        print(line)
+
+    if args.save:
+        save_baseline(args.save, results, args.ruleset)
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        for key, before, after, slower in regressions:
+            print(f"REGRESSION {key}: {before:,.1f} -> {after:,.1f} ({slower:.1f}% slower)", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,37 @@
+import argparse
+import copy
+import cProfile
+import csv
 import json
+import math
+import os
 import random
+import socket
+import sqlite3
+import stat
+import struct
+import sys
+import threading
 import time
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
-import keyboard
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import keyboard
+except ImportError:
+    keyboard = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 WIDTH, HEIGHT = 10, 20
 EMPTY = "  "
@@ -12,8 +40,14 @@ GHOST = ".."
 
 START_FALL_SPEED = 0.60
 MIN_FALL_SPEED = 0.08
+FRAME_TIME = 0.05
+DAS_DELAY = 0.17
+ARR_INTERVAL = 0.05
+SOFT_DROP_INTERVAL = 0.05
 PREVIEW_COUNT = 5
+PREVIEW_LABELS = tuple(f"{i}." for i in range(1, PREVIEW_COUNT + 1))
 HIGH_SCORE_FILE = Path(__file__).with_name("highscore.json")
+LANG_DIR = Path(__file__).with_name("lang")
 DIFFICULTY_SPEEDS = {
     "easy": 0.80,
     "normal": 0.60,
@@ -27,7 +61,12 @@ LINE_CLEAR_SCORES = {
     3: 500,
     4: 800,
 }
+T_SPIN_SCORES = {0: 400, 1: 800, 2: 1200, 3: 1600}
+T_SPIN_MINI_SCORES = {0: 100, 1: 200, 2: 400}
+T_SPIN_FULL = "full"
+T_SPIN_MINI = "mini"
 LEADERBOARD_LIMIT = 10
+HIGH_SCORE_FLUSH_INTERVAL = 5.0
 
 
 def _sanitize_initials(text):
@@ -50,15 +89,31 @@ def _normalize_leaderboard(entries):
     return normalized[:LEADERBOARD_LIMIT]
 
 
-def load_scores_data():
+def _atomic_write_text(path, text):
+    # Readers see either the old file or the new one, never a half-written file.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _parse_scores_data(text):
     data = {"high_score": 0, "leaderboard": []}
     try:
-        if HIGH_SCORE_FILE.exists():
-            raw = json.loads(HIGH_SCORE_FILE.read_text(encoding="utf-8"))
-            if isinstance(raw, dict):
-                data["high_score"] = int(raw.get("high_score", 0))
-                data["leaderboard"] = _normalize_leaderboard(raw.get("leaderboard", []))
-    except (OSError, json.JSONDecodeError, ValueError, TypeError):
+        raw = json.loads(text)
+        if isinstance(raw, dict):
+            data["high_score"] = int(raw.get("high_score", 0))
+            data["leaderboard"] = _normalize_leaderboard(raw.get("leaderboard", []))
+    except (json.JSONDecodeError, ValueError, TypeError):
         pass
 
     if data["leaderboard"]:
@@ -66,37 +121,291 @@ def load_scores_data():
     return data
 
 
+class JsonScoreStore:
+    # One JSON file shared by many processes: flock around read-modify-write, atomic
+    # replace on save, and a parsed copy reused until the file's inode/mtime/size changes.
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._cache_key = None
+        self._cache = {"high_score": 0, "leaderboard": []}
+
+    @contextmanager
+    def _locked(self):
+        lock_file = None
+        if fcntl is not None:
+            try:
+                lock_file = open(self.lock_path, "a")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except OSError:
+                if lock_file is not None:
+                    lock_file.close()
+                lock_file = None
+        try:
+            yield
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _read(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return {"high_score": 0, "leaderboard": []}
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key != self._cache_key:
+            try:
+                self._cache = _parse_scores_data(self.path.read_text(encoding="utf-8"))
+            except OSError:
+                return {"high_score": 0, "leaderboard": []}
+            self._cache_key = key
+        return self._cache
+
+    def _write(self, data):
+        payload = {
+            "high_score": int(data.get("high_score", 0)),
+            "leaderboard": _normalize_leaderboard(data.get("leaderboard", [])),
+        }
+        try:
+            _atomic_write_text(self.path, json.dumps(payload, indent=2))
+        except OSError:
+            pass
+
+    def load(self):
+        data = self._read()
+        return {"high_score": data["high_score"], "leaderboard": [dict(e) for e in data["leaderboard"]]}
+
+    def save(self, data):
+        with self._locked():
+            self._write(data)
+
+    def update(self, mutate):
+        with self._locked():
+            data = self.load()
+            mutate(data)
+            self._write(data)
+        return data
+
+    def qualifies(self, score):
+        if score <= 0:
+            return False
+        board = self._read()["leaderboard"]
+        if len(board) < LEADERBOARD_LIMIT:
+            return True
+        return score > board[-1]["score"]
+
+    def add_entry(self, initials, score, **details):
+        # The JSON file only keeps initials and score; per-game details need SqliteScoreStore.
+        def mutate(data):
+            board = data["leaderboard"]
+            board.append({"initials": _sanitize_initials(initials), "score": int(score)})
+            data["leaderboard"] = _normalize_leaderboard(board)
+            if data["leaderboard"]:
+                data["high_score"] = max(int(data.get("high_score", 0)), data["leaderboard"][0]["score"])
+
+        self.update(mutate)
+
+    def record_game(self, initials, score, **details):
+        # No history in the JSON file; games only reach it through add_entry.
+        return None
+
+    def raise_high_score(self, score):
+        def mutate(data):
+            data["high_score"] = max(int(data.get("high_score", 0)), int(score))
+
+        self.update(mutate)
+
+
+class SqliteScoreStore:
+    # Unlimited game history in SQLite; the leaderboard is the top LEADERBOARD_LIMIT rows
+    # of an index on score, so nothing has to load the whole table.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            initials TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            seed INTEGER,
+            difficulty TEXT,
+            lines INTEGER,
+            level INTEGER,
+            duration REAL,
+            played_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC);
+        CREATE INDEX IF NOT EXISTS games_by_initials ON games (initials, score DESC);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS score_counts (
+            level INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (level, bucket)
+        ) WITHOUT ROWID;
+    """
+    # score_counts holds, for each level k, how many games have each value of score >> k.
+    # A rank then sums one bucket per zero bit of the score instead of counting every
+    # higher row: O(RANK_LEVELS) lookups whatever the table size, one upsert per level per game.
+    RANK_LEVELS = 63
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Under the write lock, so a second process opening a new file waits for the first.
+            self._conn.executescript(
+                "BEGIN IMMEDIATE;"
+                + self.SCHEMA
+                + "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', 1); COMMIT;"
+            )
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _stored_high_score(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'high_score'").fetchone()
+        return row[0] if row else 0
+
+    def load(self):
+        board = [{"initials": initials, "score": score} for initials, score in self.top_scores(LEADERBOARD_LIMIT)]
+        high_score = self._stored_high_score()
+        if board:
+            high_score = max(high_score, board[0]["score"])
+        return {"high_score": high_score, "leaderboard": board}
+
+    def save(self, data):
+        # Games are history rows written by add_entry; only the standalone record is saved here.
+        self.raise_high_score(data.get("high_score", 0))
+
+    def qualifies(self, score):
+        if score <= 0:
+            return False
+        row = self.conn.execute(
+            "SELECT score FROM games ORDER BY score DESC LIMIT 1 OFFSET ?",
+            (LEADERBOARD_LIMIT - 1,),
+        ).fetchone()
+        return row is None or score > row[0]
+
+    def record_game(self, initials, score, seed=None, difficulty=None, lines=None, level=None, duration=None):
+        # Returns the row id, which add_entry(game_id=...) renames once the player types initials.
+        row = (_sanitize_initials(initials), int(score), seed, difficulty, lines, level, duration, time.time())
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO games (initials, score, seed, difficulty, lines, level, duration, played_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._count_scores([row[1]])
+        return cursor.lastrowid
+
+    def add_entry(self, initials, score, game_id=None, seed=None, difficulty=None, lines=None, level=None, duration=None):
+        if game_id is None:
+            self.add_entries([(initials, score, seed, difficulty, lines, level, duration)])
+            return
+        with self.conn:
+            self.conn.execute("UPDATE games SET initials = ? WHERE id = ?", (_sanitize_initials(initials), game_id))
+
+    def add_entries(self, entries):
+        now = time.time()
+        rows = [
+            (_sanitize_initials(initials), int(score), seed, difficulty, lines, level, duration, now)
+            for initials, score, seed, difficulty, lines, level, duration in entries
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO games (initials, score, seed, difficulty, lines, level, duration, played_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._count_scores(row[1] for row in rows)
+
+    def _count_scores(self, scores):
+        counts = Counter((level, score >> level) for score in scores for level in range(self.RANK_LEVELS))
+        self.conn.executemany(
+            "INSERT INTO score_counts (level, bucket, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (level, bucket) DO UPDATE SET count = count + excluded.count",
+            [(level, bucket, count) for (level, bucket), count in counts.items()],
+        )
+
+    def raise_high_score(self, score):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('high_score', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+                (int(score),),
+            )
+
+    def top_scores(self, limit):
+        return self.conn.execute(
+            "SELECT initials, score FROM games ORDER BY score DESC, id LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def rank_of_score(self, score):
+        # A higher score first differs from `score` at a bit where `score` has 0 and it has 1,
+        # so it is counted exactly once, in bucket (score >> k) + 1 of that bit's level k.
+        score = max(int(score), 0)
+        keys = [(level, (score >> level) + 1) for level in range(self.RANK_LEVELS) if not (score >> level) & 1]
+        if not keys:
+            return 1
+        # OR'd point lookups, which SQLite serves from the primary key (a row-value IN scans).
+        (higher,) = self.conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE "
+            + " OR ".join("(level = ? AND bucket = ?)" for _ in keys),
+            [value for key in keys for value in key],
+        ).fetchone()
+        return higher + 1
+
+    def best_for_initials(self, initials):
+        row = self.conn.execute(
+            "SELECT score, seed, difficulty, lines, level, duration, played_at FROM games "
+            "WHERE initials = ? ORDER BY score DESC LIMIT 1",
+            (_sanitize_initials(initials),),
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("score", "seed", "difficulty", "lines", "level", "duration", "played_at")
+        return dict(zip(keys, row))
+
+
+score_store = JsonScoreStore(HIGH_SCORE_FILE)
+
+
+def set_score_store(store):
+    global score_store
+    score_store = store
+
+
+def load_scores_data():
+    return score_store.load()
+
+
 def save_scores_data(data):
-    payload = {
-        "high_score": int(data.get("high_score", 0)),
-        "leaderboard": _normalize_leaderboard(data.get("leaderboard", [])),
-    }
-    try:
-        HIGH_SCORE_FILE.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    except OSError:
-        pass
+    score_store.save(data)
 
 
 def score_qualifies_for_leaderboard(score):
-    if score <= 0:
-        return False
-    data = load_scores_data()
-    board = data["leaderboard"]
-    if len(board) < LEADERBOARD_LIMIT:
-        return True
-    return score > board[-1]["score"]
+    return score_store.qualifies(score)
+
+
+def record_game(initials, score, **details):
+    return score_store.record_game(initials, score, **details)
 
 
-def add_leaderboard_entry(initials, score):
+def add_leaderboard_entry(initials, score, **details):
     if score <= 0:
         return
-    data = load_scores_data()
-    board = data["leaderboard"]
-    board.append({"initials": _sanitize_initials(initials), "score": int(score)})
-    data["leaderboard"] = _normalize_leaderboard(board)
-    if data["leaderboard"]:
-        data["high_score"] = max(int(data.get("high_score", 0)), data["leaderboard"][0]["score"])
-    save_scores_data(data)
+    score_store.add_entry(initials, score, **details)
+
 
 DEFAULT_OPTIONS = {
     "show_ghost": True,
@@ -106,780 +415,35 @@ DEFAULT_OPTIONS = {
 
 LANGUAGE_ORDER = ["en", "es", "ru", "uk", "be", "kk", "fr", "de", "it", "ka", "hy", "az", "nl", "vl", "fy"]
 
-TEXTS = {
-    "en": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Play",
-        "version": "Version rc-1.05.00",
-        "options": "Options",
-        "leaderboard": "Leaderboard",
-        "exit": "Exit",
-        "select_1_3": "Select an option (1-3): ",
-        "select_1_4": "Select an option (1-4): ",
-        "select_1_5": "Select an option (1-5): ",
-        "select_1_7": "Select an option (1-7): ",
-        "select_1_10": "Select an option (1-10): ",
-        "select_1_13": "Select an option (1-13): ",
-        "select_1_16": "Select an option (1-16): ",
-        "options_title": "--- OPTIONS ---",
-        "ghost_piece": "Ghost Piece",
-        "difficulty": "Difficulty",
-        "language": "Language",
-        "reset_defaults": "Reset Defaults",
-        "back": "Back",
-        "state_on": "ON",
-        "state_off": "OFF",
-        "language_title": "--- LANGUAGE ---",
-        "language_current": "Current: {language}",
-        "english": "English",
-        "spanish": "Spanish",
-        "russian": "Russian",
-        "ukrainian": "Ukrainian",
-        "belarusian": "Belarusian",
-        "kazakh": "Kazakh",
-        "french": "French",
-        "german": "German",
-        "italian": "Italian",
-        "georgian": "Georgian",
-        "armenian": "Armenian",
-        "azerbaijani": "Azerbaijani",
-        "dutch": "Dutch",
-        "flemish": "Flemish",
-        "frisian": "Frisian",
-        "difficulty_easy": "Easy",
-        "difficulty_normal": "Normal",
-        "difficulty_hard": "Hard",
-        "difficulty_extreme": "Extreme",
-        "game_header": "--- TETRIS --- SCORE: {score} | HIGH: {high} | LEVEL: {level} | LINES: {lines}",
-        "hold": "HOLD:",
-        "next": "NEXT:",
-        "empty": "(empty)",
-        "paused": "PAUSED - Press P to resume",
-        "controls_1": "Up: Rotate | Left/Right: Move | Down: Soft drop | Space: Hard drop",
-        "controls_2": "Shift: Hold | P: Pause | R: Restart | Q: Back to menu",
-        "controls_hint": "Press H to show/hide controls",
-        "game_over": "GAME OVER - Press R to restart or Q to go back to menu",
-        "leaderboard_title": "--- LEADERBOARD ---",
-        "no_scores": "No scores yet.",
-        "initials_prompt": "New leaderboard score. Enter initials (3 chars): ",
-        "initials_saved": "Saved: {initials} - {score}",
-        "press_enter": "Press Enter to continue...",
-        "bye": "Bye",
-    },
-    "es": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Jugar",
-        "version": "Versión cal-1.05.00",
-        "options": "Opciones",
-        "exit": "Salir",
-        "select_1_3": "Selecciona una opcion (1-3): ",
-        "select_1_4": "Selecciona una opcion (1-4): ",
-        "select_1_5": "Selecciona una opcion (1-5): ",
-        "select_1_7": "Selecciona una opcion (1-7): ",
-        "select_1_10": "Selecciona una opcion (1-10): ",
-        "select_1_13": "Selecciona una opcion (1-13): ",
-        "select_1_16": "Selecciona una opcion (1-16): ",
-        "options_title": "--- OPCIONES ---",
-        "ghost_piece": "Pieza Fantasma",
-        "difficulty": "Dificultad",
-        "language": "Idioma",
-        "reset_defaults": "Restablecer",
-        "back": "Atras",
-        "state_on": "ACTIVADO",
-        "state_off": "DESACTIVADO",
-        "language_title": "--- IDIOMA ---",
-        "language_current": "Actual: {language}",
-        "english": "Ingles",
-        "spanish": "Espanol",
-        "russian": "Ruso",
-        "ukrainian": "Ucraniano",
-        "belarusian": "Bielorruso",
-        "kazakh": "Kazajo",
-        "french": "Frances",
-        "german": "Aleman",
-        "italian": "Italiano",
-        "georgian": "Georgiano",
-        "armenian": "Armenio",
-        "azerbaijani": "Azerbaiyano",
-        "dutch": "Neerlandes",
-        "flemish": "Flamenco",
-        "frisian": "Frison",
-        "difficulty_easy": "Facil",
-        "difficulty_normal": "Normal",
-        "difficulty_hard": "Dificil",
-        "difficulty_extreme": "Extremo",
-        "game_header": "--- TETRIS --- PUNTOS: {score} | RECORD: {high} | NIVEL: {level} | LINEAS: {lines}",
-        "hold": "GUARDADA:",
-        "next": "SIGUIENTES:",
-        "empty": "(vacio)",
-        "paused": "PAUSA - Pulsa P para continuar",
-        "controls_1": "Arriba: Girar | Izq/Der: Mover | Abajo: Caida suave | Espacio: Caida dura",
-        "controls_2": "Shift: Guardar | P: Pausa | R: Reiniciar | Q: Volver al menu",
-        "controls_hint": "Pulsa H para mostrar/ocultar controles",
-        "game_over": "FIN DEL JUEGO - Pulsa R para reiniciar o Q para volver al menu",
-        "bye": "Adios",
-    },
-    "ru": {
-        "main_title": """
-█████ ████   █████   ████  █   █   ████
-  █       █    █    █   █  █  ██  █        
-  █     ██     █     ████  █ █ █  █    
-  █       █    █    █   █  ██  █  █       
-  █   ████     █    █   █  █   █   ████ 
-""",
-        "version": "Версия КНР-1.05.00",
-        "play": "Играть",
-        "options": "Опции",
-        "exit": "Выход",
-        "select_1_3": "Выберите пункт (1-3): ",
-        "select_1_4": "Выберите пункт (1-4): ",
-        "options_title": "--- ОПЦИИ ---",
-        "ghost_piece": "Призрак фигуры",
-        "language": "Язык",
-        "reset_defaults": "Сбросить",
-        "back": "Назад",
-        "state_on": "ВКЛ",
-        "state_off": "ВЫКЛ",
-        "language_title": "--- ЯЗЫК ---",
-        "language_current": "Текущий: {language}",
-        "english": "Английский",
-        "spanish": "Испанский",
-        "russian": "Русский",
-        "game_header": "--- ТЕТРИС --- СЧЕТ: {score} | РЕКОРД: {high} | УРОВЕНЬ: {level} | ЛИНИИ: {lines}",
-        "hold": "УДЕРЖАНИЕ:",
-        "next": "СЛЕДУЮЩИЕ:",
-        "empty": "(пусто)",
-        "paused": "ПАУЗА - Нажмите P для продолжения",
-        "controls_1": "Вверх: Поворот | Влево/Вправо: Движение | Вниз: Мягкий сброс | Пробел: Жесткий сброс",
-        "controls_2": "Shift: Удержать | P: Пауза | R: Рестарт | Q: В меню",
-        "controls_hint": "Нажмите H, чтобы показать/скрыть управление",
-        "game_over": "ИГРА ОКОНЧЕНА - Нажмите R для рестарта или Q для меню",
-        "bye": "Пока",
-    },
-    "uk": {
-        "main_title": """
-█████ ████   █████   ████  █████   ████
-  █       █    █    █   █    █    █        
-  █     ██     █     ████    █    █    
-  █       █    █    █   █    █    █       
-  █   ████     █    █   █  █████   ████ 
-""",
-        "version": "Версія ЗК-1.05.00",
-        "play": "Грати",
-        "options": "Опції",
-        "exit": "Вихід",
-        "select_1_3": "Оберіть пункт (1-3): ",
-        "select_1_4": "Оберіть пункт (1-4): ",
-        "select_1_7": "Оберіть пункт (1-7): ",
-        "options_title": "--- ОПЦІЇ ---",
-        "ghost_piece": "Привид фігури",
-        "language": "Мова",
-        "reset_defaults": "Скинути",
-        "back": "Назад",
-        "state_on": "УВІМК",
-        "state_off": "ВИМК",
-        "language_title": "--- МОВА ---",
-        "language_current": "Поточна: {language}",
-        "english": "Англійська",
-        "spanish": "Іспанська",
-        "russian": "Російська",
-        "ukrainian": "Українська",
-        "belarusian": "Білоруська",
-        "kazakh": "Казахська",
-        "controls_hint": "Натисніть H, щоб показати/сховати керування",
-        "game_over": "ГРУ ЗАКІНЧЕНО - Натисніть R для рестарту або Q для меню",
-        "bye": "Бувай",
-    },
-    "be": {
-        "main_title": """
-█████ ████   █████   ████  █████   ████
-  █       █    █    █   █    █    █        
-  █     ██     █     ████    █    █    
-  █       █    █    █   █    █    █       
-  █   ████     █    █   █  █████   ████ 
-""",
-        "version": "Версія КНВ-1.05.00",
-        "play": "Гуляць",
-        "options": "Налады",
-        "exit": "Выйсці",
-        "select_1_3": "Выберыце пункт (1-3): ",
-        "select_1_4": "Выберыце пункт (1-4): ",
-        "select_1_7": "Выберыце пункт (1-7): ",
-        "options_title": "--- НАЛАДЫ ---",
-        "ghost_piece": "Прывід фігуры",
-        "language": "Мова",
-        "reset_defaults": "Скінуць",
-        "back": "Назад",
-        "state_on": "УКЛ",
-        "state_off": "ВЫКЛ",
-        "language_title": "--- МОВА ---",
-        "language_current": "Бягучая: {language}",
-        "english": "Англійская",
-        "spanish": "Іспанская",
-        "russian": "Руская",
-        "ukrainian": "Украінская",
-        "belarusian": "Беларуская",
-        "kazakh": "Казахская",
-        "controls_hint": "Націсніце H, каб паказаць/схаваць кіраванне",
-        "game_over": "ГУЛЬНЯ СКОНЧАНА - Націсніце R для рэстарту або Q для меню",
-        "bye": "Пакуль",
-    },
-    "kk": {
-        "main_title": """
-█████ ████   █████   ████  █   █   ████
-  █       █    █    █   █  █  ██  █        
-  █     ██     █     ████  █ █ █  █    
-  █       █    █    █   █  ██  █  █       
-  █   ████     █    █   █  █   █   ████ 
-""",
-        "version": "Нұсқа КБ-1.05.00",
-        "play": "Ойнау",
-        "options": "Баптаулар",
-        "exit": "Шығу",
-        "select_1_3": "Таңдаңыз (1-3): ",
-        "select_1_4": "Таңдаңыз (1-4): ",
-        "select_1_7": "Таңдаңыз (1-7): ",
-        "options_title": "--- БАПТАУЛАР ---",
-        "ghost_piece": "Елес фигура",
-        "language": "Тіл",
-        "reset_defaults": "Әдепкіге қайтару",
-        "back": "Артқа",
-        "state_on": "ҚОСУЛЫ",
-        "state_off": "ӨШІРУЛІ",
-        "language_title": "--- ТІЛ ---",
-        "language_current": "Ағымдағы: {language}",
-        "english": "Ағылшын",
-        "spanish": "Испан",
-        "russian": "Орыс",
-        "ukrainian": "Украин",
-        "belarusian": "Беларусь",
-        "kazakh": "Қазақ",
-        "controls_hint": "Басқаруды көрсету/жасыру үшін H басыңыз",
-        "game_over": "ОЙЫН АЯҚТАЛДЫ - Қайта бастау үшін R, мәзір үшін Q",
-        "bye": "Сау бол",
-    },
-    "fr": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Jouer",
-        "version": "Version rc-1.05.00",
-        "options": "Options",
-        "exit": "Quitter",
-        "select_1_3": "Choisissez une option (1-3): ",
-        "select_1_4": "Choisissez une option (1-4): ",
-        "select_1_5": "Choisissez une option (1-5): ",
-        "select_1_10": "Choisissez une option (1-10): ",
-        "options_title": "--- OPTIONS ---",
-        "ghost_piece": "Piece fantome",
-        "difficulty": "Difficulte",
-        "language": "Langue",
-        "reset_defaults": "Reinitialiser",
-        "back": "Retour",
-        "state_on": "ACTIF",
-        "state_off": "INACTIF",
-        "language_title": "--- LANGUE ---",
-        "language_current": "Actuelle: {language}",
-        "english": "Anglais",
-        "spanish": "Espagnol",
-        "russian": "Russe",
-        "ukrainian": "Ukrainien",
-        "belarusian": "Bielorusse",
-        "kazakh": "Kazakh",
-        "french": "Francais",
-        "german": "Allemand",
-        "italian": "Italien",
-        "difficulty_easy": "Facile",
-        "difficulty_normal": "Normal",
-        "difficulty_hard": "Difficile",
-        "difficulty_extreme": "Extreme",
-        "game_header": "--- TETRIS --- SCORE: {score} | RECORD: {high} | NIVEAU: {level} | LIGNES: {lines}",
-        "hold": "RESERVE:",
-        "next": "SUIVANT:",
-        "empty": "(vide)",
-        "paused": "PAUSE - Appuyez sur P pour reprendre",
-        "controls_1": "Haut: Rotation | Gauche/Droite: Deplacer | Bas: Descente douce | Espace: Chute rapide",
-        "controls_2": "Shift: Garder | P: Pause | R: Recommencer | Q: Menu",
-        "controls_hint": "Appuyez sur H pour afficher/masquer les commandes",
-        "game_over": "PARTIE TERMINEE - Appuyez sur R pour recommencer ou Q pour le menu",
-        "bye": "Au revoir",
-    },
-    "de": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Spielen",
-        "version": "Version rc-1.05.00",
-        "options": "Optionen",
-        "exit": "Beenden",
-        "select_1_3": "Option waehlen (1-3): ",
-        "select_1_4": "Option waehlen (1-4): ",
-        "select_1_5": "Option waehlen (1-5): ",
-        "select_1_10": "Option waehlen (1-10): ",
-        "options_title": "--- OPTIONEN ---",
-        "ghost_piece": "Geisterstein",
-        "difficulty": "Schwierigkeit",
-        "language": "Sprache",
-        "reset_defaults": "Zuruecksetzen",
-        "back": "Zurueck",
-        "state_on": "AN",
-        "state_off": "AUS",
-        "language_title": "--- SPRACHE ---",
-        "language_current": "Aktuell: {language}",
-        "english": "Englisch",
-        "spanish": "Spanisch",
-        "russian": "Russisch",
-        "ukrainian": "Ukrainisch",
-        "belarusian": "Belarussisch",
-        "kazakh": "Kasachisch",
-        "french": "Franzoesisch",
-        "german": "Deutsch",
-        "italian": "Italienisch",
-        "difficulty_easy": "Leicht",
-        "difficulty_normal": "Normal",
-        "difficulty_hard": "Schwer",
-        "difficulty_extreme": "Extrem",
-        "game_header": "--- TETRIS --- PUNKTE: {score} | REKORD: {high} | LEVEL: {level} | LINIEN: {lines}",
-        "hold": "HALTEN:",
-        "next": "NAECHSTE:",
-        "empty": "(leer)",
-        "paused": "PAUSE - Druecke P zum Fortsetzen",
-        "controls_1": "Oben: Drehen | Links/Rechts: Bewegen | Unten: Soft Drop | Leertaste: Hard Drop",
-        "controls_2": "Shift: Halten | P: Pause | R: Neustart | Q: Menue",
-        "controls_hint": "Druecke H, um Steuerung ein/auszublenden",
-        "game_over": "SPIEL VORBEI - Druecke R fuer Neustart oder Q fuer Menue",
-        "bye": "Tschuess",
-    },
-    "it": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Gioca",
-        "version": "Versione rc-1.05.00",
-        "options": "Opzioni",
-        "exit": "Esci",
-        "select_1_3": "Seleziona un'opzione (1-3): ",
-        "select_1_4": "Seleziona un'opzione (1-4): ",
-        "select_1_5": "Seleziona un'opzione (1-5): ",
-        "select_1_10": "Seleziona un'opzione (1-10): ",
-        "options_title": "--- OPZIONI ---",
-        "ghost_piece": "Pezzo fantasma",
-        "difficulty": "Difficolta",
-        "language": "Lingua",
-        "reset_defaults": "Ripristina",
-        "back": "Indietro",
-        "state_on": "ON",
-        "state_off": "OFF",
-        "language_title": "--- LINGUA ---",
-        "language_current": "Corrente: {language}",
-        "english": "Inglese",
-        "spanish": "Spagnolo",
-        "russian": "Russo",
-        "ukrainian": "Ucraino",
-        "belarusian": "Bielorusso",
-        "kazakh": "Kazako",
-        "french": "Francese",
-        "german": "Tedesco",
-        "italian": "Italiano",
-        "difficulty_easy": "Facile",
-        "difficulty_normal": "Normale",
-        "difficulty_hard": "Difficile",
-        "difficulty_extreme": "Estremo",
-        "game_header": "--- TETRIS --- PUNTEGGIO: {score} | RECORD: {high} | LIVELLO: {level} | LINEE: {lines}",
-        "hold": "HOLD:",
-        "next": "PROSSIMI:",
-        "empty": "(vuoto)",
-        "paused": "PAUSA - Premi P per continuare",
-        "controls_1": "Su: Ruota | Sinistra/Destra: Muovi | Giu: Discesa lenta | Spazio: Caduta rapida",
-        "controls_2": "Shift: Hold | P: Pausa | R: Riavvia | Q: Menu",
-        "controls_hint": "Premi H per mostrare/nascondere i comandi",
-        "game_over": "PARTITA FINITA - Premi R per riavviare o Q per il menu",
-        "bye": "Ciao",
-    },
-    "ka": {
-        "main_title": """
-  █     ███     █     ████        █    
-  █    █   █    █    █            █    
- ███       █   ███    █ █    ███  █  █   ███ 
-█   █  █   █  █   █  █ █ █  █   █ █   █ █   █
- ███    ███    ███   █   █  █   █  ███  █   █
-""",
-        "play": "თამაში",
-        "version": "ვერსია ქრთ-1.05.00",
-        "options": "პარამეტრები",
-        "leaderboard": "ლიდერბორდი",
-        "exit": "გასვლა",
-        "select_1_4": "აირჩიეთ ვარიანტი (1-4): ",
-        "select_1_5": "აირჩიეთ ვარიანტი (1-5): ",
-        "select_1_13": "აირჩიეთ ვარიანტი (1-13): ",
-        "options_title": "--- პარამეტრები ---",
-        "ghost_piece": "აჩრდილის ფიგურა",
-        "difficulty": "სირთულე",
-        "language": "ენა",
-        "reset_defaults": "საწყისზე დაბრუნება",
-        "back": "უკან",
-        "state_on": "ჩართული",
-        "state_off": "გამორთული",
-        "language_title": "--- ენა ---",
-        "language_current": "მიმდინარე: {language}",
-        "english": "ინგლისური",
-        "spanish": "ესპანური",
-        "russian": "რუსული",
-        "ukrainian": "უკრაინული",
-        "belarusian": "ბელარუსული",
-        "kazakh": "ყაზახური",
-        "french": "ფრანგული",
-        "german": "გერმანული",
-        "italian": "იტალიური",
-        "georgian": "ქართული",
-        "armenian": "სომხური",
-        "azerbaijani": "აზერბაიჯანული",
-        "difficulty_easy": "მარტივი",
-        "difficulty_normal": "საშუალო",
-        "difficulty_hard": "რთული",
-        "difficulty_extreme": "ექსტრემალური",
-        "game_header": "--- ტეტრისი --- ქულა: {score} | რეკორდი: {high} | დონე: {level} | ხაზები: {lines}",
-        "hold": "დაჭერა:",
-        "next": "შემდეგი:",
-        "empty": "(ცარიელი)",
-        "paused": "პაუზა - გაგრძელებისთვის დააჭირეთ P",
-        "controls_1": "ზემოთ: მობრუნება | მარცხ/მარჯვ: მოძრაობა | ქვემოთ: ნელი ვარდნა | Space: სწრაფი ვარდნა",
-        "controls_2": "Shift: დაჭერა | P: პაუზა | R: თავიდან | Q: მენიუ",
-        "controls_hint": "H-ს დაჭერით აჩვენეთ/დამალეთ მართვა",
-        "game_over": "თამაში დასრულდა - R თავიდან ან Q მენიუში",
-        "leaderboard_title": "--- ლიდერბორდი ---",
-        "no_scores": "ქულები ჯერ არ არის.",
-        "initials_prompt": "ახალი შედეგი! შეიყვანეთ ინიციალები (3 სიმბოლო): ",
-        "initials_saved": "შენახულია: {initials} - {score}",
-        "press_enter": "გასაგრძელებლად Enter...",
-        "bye": "ნახვამდის",
-    },
-    "hy": {
-        "main_title": """
-█████ █      █   █   █████ █     █   █
-█     █      █  █ █  █   █ █     █   █
-█████ █████  █  █ █  █   █ █████ █   █
-    █ █      █  █ █  █     █   █ █   █
-█████ █████  ████ █  █     █     █████
-""",
-        "play": "Խաղալ",
-        "version": "Տարբերակ հտ-1.05.00",
-        "options": "Կարգավորումներ",
-        "leaderboard": "Վարկանիշ",
-        "exit": "Ելք",
-        "select_1_4": "Ընտրեք տարբերակ (1-4): ",
-        "select_1_5": "Ընտրեք տարբերակ (1-5): ",
-        "select_1_13": "Ընտրեք տարբերակ (1-13): ",
-        "options_title": "--- ԿԱՐԳԱՎՈՐՈՒՄՆԵՐ ---",
-        "ghost_piece": "Ուրվական ֆիգուր",
-        "difficulty": "Դժվարություն",
-        "language": "Լեզու",
-        "reset_defaults": "Վերակայել",
-        "back": "Հետ",
-        "state_on": "Միացված",
-        "state_off": "Անջատված",
-        "language_title": "--- ԼԵԶՈՒ ---",
-        "language_current": "Ընթացիկ: {language}",
-        "english": "Անգլերեն",
-        "spanish": "Իսպաներեն",
-        "russian": "Ռուսերեն",
-        "ukrainian": "Ուկրաիներեն",
-        "belarusian": "Բելառուսերեն",
-        "kazakh": "Ղազախերեն",
-        "french": "Ֆրանսերեն",
-        "german": "Գերմաներեն",
-        "italian": "Իտալերեն",
-        "georgian": "Վրացերեն",
-        "armenian": "Հայերեն",
-        "azerbaijani": "Ադրբեջաներեն",
-        "difficulty_easy": "Հեշտ",
-        "difficulty_normal": "Նորմալ",
-        "difficulty_hard": "Դժվար",
-        "difficulty_extreme": "Էքստրիմ",
-        "game_header": "--- TETRIS --- ՄԻԱՎՈՐ: {score} | ՌԵԿՈՐԴ: {high} | ՄԱԿԱՐԴԱԿ: {level} | ԳԾԵՐ: {lines}",
-        "hold": "ՊԱՀԵԼ:",
-        "next": "ՀԱՋՈՐԴԸ:",
-        "empty": "(դատարկ)",
-        "paused": "ԴԱԴԱՐ - Շարունակելու համար սեղմեք P",
-        "controls_1": "Վերև: Պտտել | Ձախ/Աջ: Շարժել | Ներքև: Դանդաղ իջեցում | Space: Արագ իջեցում",
-        "controls_2": "Shift: Պահել | P: Դադար | R: Վերսկսել | Q: Մենյու",
-        "controls_hint": "Սեղմեք H՝ կառավարումը ցույց տալու/թաքցնելու համար",
-        "game_over": "ԽԱՂԸ ՎԵՐՋԱՑԱՎ - Սեղմեք R՝ նորից կամ Q՝ մենյու",
-        "leaderboard_title": "--- ՎԱՐԿԱՆԻՇ ---",
-        "no_scores": "Միավորներ դեռ չկան։",
-        "initials_prompt": "Նոր արդյունք։ Մուտքագրեք սկզբնատառերը (3): ",
-        "initials_saved": "Պահվեց: {initials} - {score}",
-        "press_enter": "Շարունակելու համար Enter...",
-        "bye": "Ցտեսություն",
-    },
-    "az": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Oyna",
-        "version": "Versiya azr-1.05.00",
-        "options": "Seçimlər",
-        "leaderboard": "Liderlər cədvəli",
-        "exit": "Çıxış",
-        "select_1_4": "Seçim edin (1-4): ",
-        "select_1_5": "Seçim edin (1-5): ",
-        "select_1_13": "Seçim edin (1-13): ",
-        "options_title": "--- SEÇİMLƏR ---",
-        "ghost_piece": "Kölgə fiqur",
-        "difficulty": "Çətinlik",
-        "language": "Dil",
-        "reset_defaults": "Sıfırla",
-        "back": "Geri",
-        "state_on": "AÇIQ",
-        "state_off": "QAPALI",
-        "language_title": "--- DİL ---",
-        "language_current": "Cari: {language}",
-        "english": "İngilis",
-        "spanish": "İspan",
-        "russian": "Rus",
-        "ukrainian": "Ukrayna",
-        "belarusian": "Belarus",
-        "kazakh": "Qazax",
-        "french": "Fransız",
-        "german": "Alman",
-        "italian": "İtalyan",
-        "georgian": "Gürcü",
-        "armenian": "Erməni",
-        "azerbaijani": "Azərbaycan",
-        "difficulty_easy": "Asan",
-        "difficulty_normal": "Normal",
-        "difficulty_hard": "Çətin",
-        "difficulty_extreme": "Ekstrem",
-        "game_header": "--- TETRIS --- XAL: {score} | REKORD: {high} | SƏVİYYƏ: {level} | XƏTLƏR: {lines}",
-        "hold": "SAXLA:",
-        "next": "NÖVBƏTİ:",
-        "empty": "(boş)",
-        "paused": "PAUZA - Davam üçün P basın",
-        "controls_1": "Yuxarı: Döndür | Sol/Sağ: Hərəkət | Aşağı: Yumşaq düşüş | Space: Sərt düşüş",
-        "controls_2": "Shift: Saxla | P: Pauza | R: Yenidən başla | Q: Menyu",
-        "controls_hint": "İdarəni göstərmək/gizlətmək üçün H basın",
-        "game_over": "OYUN BİTDİ - Yenidən başlamaq üçün R, menyu üçün Q",
-        "leaderboard_title": "--- LİDERLƏR CƏDVƏLİ ---",
-        "no_scores": "Hələ xal yoxdur.",
-        "initials_prompt": "Yeni nəticə! İnitialları daxil edin (3 simvol): ",
-        "initials_saved": "Yadda saxlanıldı: {initials} - {score}",
-        "press_enter": "Davam etmək üçün Enter...",
-        "bye": "Sağ ol",
-    },
-    "nl": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Spelen",
-        "version": "Versie nl-1.05.00",
-        "options": "Opties",
-        "leaderboard": "Ranglijst",
-        "exit": "Afsluiten",
-        "select_1_4": "Kies een optie (1-4): ",
-        "select_1_5": "Kies een optie (1-5): ",
-        "select_1_16": "Kies een optie (1-16): ",
-        "options_title": "--- OPTIES ---",
-        "ghost_piece": "Spookstuk",
-        "difficulty": "Moeilijkheid",
-        "language": "Taal",
-        "reset_defaults": "Herstellen",
-        "back": "Terug",
-        "state_on": "AAN",
-        "state_off": "UIT",
-        "language_title": "--- TAAL ---",
-        "language_current": "Huidig: {language}",
-        "english": "Engels",
-        "spanish": "Spaans",
-        "russian": "Russisch",
-        "ukrainian": "Oekraïens",
-        "belarusian": "Belarussisch",
-        "kazakh": "Kazachs",
-        "french": "Frans",
-        "german": "Duits",
-        "italian": "Italiaans",
-        "georgian": "Georgisch",
-        "armenian": "Armeens",
-        "azerbaijani": "Azerbeidzjaans",
-        "dutch": "Nederlands",
-        "flemish": "Vlaams",
-        "frisian": "Fries",
-        "difficulty_easy": "Makkelijk",
-        "difficulty_normal": "Normaal",
-        "difficulty_hard": "Moeilijk",
-        "difficulty_extreme": "Extreem",
-        "game_header": "--- TETRIS --- SCORE: {score} | HIGH: {high} | LEVEL: {level} | LIJNEN: {lines}",
-        "hold": "BEWAAR:",
-        "next": "VOLGENDE:",
-        "empty": "(leeg)",
-        "paused": "PAUZE - Druk op P om verder te gaan",
-        "controls_1": "Omhoog: Draaien | Links/Rechts: Bewegen | Omlaag: Zachte val | Spatie: Harde val",
-        "controls_2": "Shift: Bewaar | P: Pauze | R: Herstart | Q: Menu",
-        "controls_hint": "Druk op H om besturing te tonen/verbergen",
-        "game_over": "SPEL VOORBIJ - Druk op R voor herstart of Q voor menu",
-        "leaderboard_title": "--- RANGLIJST ---",
-        "no_scores": "Nog geen scores.",
-        "initials_prompt": "Nieuwe ranglijstscore. Initialen (3 tekens): ",
-        "initials_saved": "Opgeslagen: {initials} - {score}",
-        "press_enter": "Druk op Enter om door te gaan...",
-        "bye": "Tot ziens",
-    },
-    "vl": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Spelen",
-        "version": "Versie vl-1.05.00",
-        "options": "Opties",
-        "leaderboard": "Klassement",
-        "exit": "Afsluiten",
-        "select_1_4": "Kies een optie (1-4): ",
-        "select_1_5": "Kies een optie (1-5): ",
-        "select_1_16": "Kies een optie (1-16): ",
-        "options_title": "--- OPTIES ---",
-        "ghost_piece": "Spookblok",
-        "difficulty": "Moeilijkheid",
-        "language": "Taal",
-        "reset_defaults": "Herstellen",
-        "back": "Terug",
-        "state_on": "AAN",
-        "state_off": "UIT",
-        "language_title": "--- TAAL ---",
-        "language_current": "Huidig: {language}",
-        "english": "Engels",
-        "spanish": "Spaans",
-        "russian": "Russisch",
-        "ukrainian": "Oekraïens",
-        "belarusian": "Wit-Russisch",
-        "kazakh": "Kazachs",
-        "french": "Frans",
-        "german": "Duits",
-        "italian": "Italiaans",
-        "georgian": "Georgisch",
-        "armenian": "Armeens",
-        "azerbaijani": "Azerbeidzjaans",
-        "dutch": "Nederlands",
-        "flemish": "Vlaams",
-        "frisian": "Fries",
-        "difficulty_easy": "Makkelijk",
-        "difficulty_normal": "Normaal",
-        "difficulty_hard": "Moeilijk",
-        "difficulty_extreme": "Extreem",
-        "game_header": "--- TETRIS --- SCORE: {score} | HIGH: {high} | LEVEL: {level} | LIJNEN: {lines}",
-        "hold": "HOUD:",
-        "next": "VOLGENDE:",
-        "empty": "(leeg)",
-        "paused": "PAUZE - Druk op P om verder te doen",
-        "controls_1": "Omhoog: Draaien | Links/Rechts: Bewegen | Omlaag: Zachte val | Spatie: Harde val",
-        "controls_2": "Shift: Hou vast | P: Pauze | R: Herstart | Q: Menu",
-        "controls_hint": "Druk op H om de besturing te tonen/verbergen",
-        "game_over": "GAME OVER - Druk op R voor herstart of Q voor menu",
-        "leaderboard_title": "--- KLASSEMENT ---",
-        "no_scores": "Nog geen scores.",
-        "initials_prompt": "Nieuwe score in klassement. Initialen (3 tekens): ",
-        "initials_saved": "Opgeslagen: {initials} - {score}",
-        "press_enter": "Druk op Enter om verder te gaan...",
-        "bye": "Daag",
-    },
-    "fy": {
-        "main_title": """
-█████ █████ █████  ████  █████ █████
-  █   █       █   █   █    █   █    
-  █   ████    █    ████    █   █████
-  █   █       █   █   █    █       █
-  █   █████   █   █   █  █████ █████ 
-""",
-        "play": "Spylje",
-        "version": "Ferzje fy-1.05.00",
-        "options": "Opsjes",
-        "leaderboard": "Klassemint",
-        "exit": "Ofslute",
-        "select_1_4": "Kies in opsje (1-4): ",
-        "select_1_5": "Kies in opsje (1-5): ",
-        "select_1_16": "Kies in opsje (1-16): ",
-        "options_title": "--- OPSJES ---",
-        "ghost_piece": "Spoekstik",
-        "difficulty": "Muoilikheid",
-        "language": "Taal",
-        "reset_defaults": "Weromsette",
-        "back": "Werom",
-        "state_on": "OAN",
-        "state_off": "UT",
-        "language_title": "--- TAAL ---",
-        "language_current": "No: {language}",
-        "english": "Ingelsk",
-        "spanish": "Spaansk",
-        "russian": "Russysk",
-        "ukrainian": "Oekraïnsk",
-        "belarusian": "Wyt-Russysk",
-        "kazakh": "Kazachsk",
-        "french": "Frânsk",
-        "german": "Dútsk",
-        "italian": "Italiaansk",
-        "georgian": "Georgysk",
-        "armenian": "Armeensk",
-        "azerbaijani": "Azerbeidzjaansk",
-        "dutch": "Nederlânsk",
-        "flemish": "Flaamsk",
-        "frisian": "Frysk",
-        "difficulty_easy": "Maklik",
-        "difficulty_normal": "Normaal",
-        "difficulty_hard": "Dreech",
-        "difficulty_extreme": "Ekstreem",
-        "game_header": "--- TETRIS --- PUNTEN: {score} | HEGE: {high} | LEVEL: {level} | LINIEN: {lines}",
-        "hold": "FÊST:",
-        "next": "FOLGJEND:",
-        "empty": "(leech)",
-        "paused": "PAUZE - Druk op P om troch te gean",
-        "controls_1": "Omheech: Draaie | Links/Rjochts: Ferpleatse | Omleech: Sêfte drop | Spaasje: Hurde drop",
-        "controls_2": "Shift: Fêsthâlde | P: Pauze | R: Opnij | Q: Menu",
-        "controls_hint": "Druk op H om bestjoering te sjen/ferbergjen",
-        "game_over": "SPUL OER - Druk op R foar opnij of Q foar menu",
-        "leaderboard_title": "--- KLASSEMINT ---",
-        "no_scores": "Noch gjin scores.",
-        "initials_prompt": "Nije klassemintscore. Inisjalen (3 tekens): ",
-        "initials_saved": "Bewarre: {initials} - {score}",
-        "press_enter": "Druk op Enter om troch te gean...",
-        "bye": "Oant sjen",
-    },
-}
 
+def _quarter_turns(cells):
+    # The four rotation states of a piece turning about (0, 0): spawn, R, 2 and L.
+    rotations = []
+    for _ in range(4):
+        rotations.append(list(cells))
+        cells = [(-y, x) for x, y in cells]
+    return rotations
+
+
+# Super Rotation System states (x right, y down). I turns about the centre of its 4x4 box,
+# so its states are listed; the others turn about cell (0, 0).
 SHAPES = {
+    "I": [
+        [(-1, 0), (0, 0), (1, 0), (2, 0)],
+        [(1, -1), (1, 0), (1, 1), (1, 2)],
+        [(-1, 1), (0, 1), (1, 1), (2, 1)],
+        [(0, -1), (0, 0), (0, 1), (0, 2)],
+    ],
+    "O": [[(0, -1), (1, -1), (0, 0), (1, 0)]],
+    "T": _quarter_turns([(0, -1), (-1, 0), (0, 0), (1, 0)]),
+    "S": _quarter_turns([(0, -1), (1, -1), (-1, 0), (0, 0)]),
+    "Z": _quarter_turns([(-1, -1), (0, -1), (0, 0), (1, 0)]),
+    "J": _quarter_turns([(-1, -1), (-1, 0), (0, 0), (1, 0)]),
+    "L": _quarter_turns([(1, -1), (-1, 0), (0, 0), (1, 0)]),
+}
+
+# The rotation states used before SRS, kept for the "classic" ruleset and old replays.
+CLASSIC_SHAPES = {
     "I": [
         [(0, -1), (0, 0), (0, 1), (0, 2)],
         [(-1, 0), (0, 0), (1, 0), (2, 0)],
@@ -910,17 +474,396 @@ SHAPES = {
 }
 
 
+FULL_MASK = (1 << WIDTH) - 1
+
+
+class DiffRenderer:
+    # Keeps the last frame and writes only the changed span of each changed line.
+    def __init__(self, stream=None):
+        # None means sys.stdout at write time, which keeps games copyable and picklable.
+        self.stream = stream
+        self.previous = []
+
+    def invalidate(self):
+        self.previous = []
+
+    def render(self, lines):
+        previous = self.previous
+        out = []
+        for row, line in enumerate(lines):
+            old = previous[row] if row < len(previous) else None
+            if line != old:
+                out.append(_line_update(row, old, line))
+        for row in range(len(lines), len(previous)):
+            out.append(f"\033[{row + 1};1H\033[K")
+        self.previous = list(lines)
+        if out:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("".join(out))
+            stream.flush()
+
+
+def _line_update(row, old, new):
+    if old is None:
+        return f"\033[{row + 1};1H{new}\033[K"
+
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    # Cursor columns are only trusted over ASCII; wide characters fall back to a full line.
+    if not new[:start].isascii():
+        start = 0
+
+    if len(old) == len(new):
+        end = len(new)
+        while end > start and old[end - 1] == new[end - 1]:
+            end -= 1
+        # The unchanged suffix stays where it is only if the rewritten span is as wide as before.
+        if old[start:end].isascii() and new[start:end].isascii():
+            return f"\033[{row + 1};{start + 1}H{new[start:end]}"
+
+    tail = "\033[K" if len(new) < len(old) or not old[start:].isascii() else ""
+    return f"\033[{row + 1};{start + 1}H{new[start:]}{tail}"
+
+
+GameState = namedtuple(
+    "GameState",
+    "seed rows shape_key rotation x y held_piece hold_used next_queue bag bags_drawn "
+    "score level lines_cleared pieces_placed combo back_to_back last_move_was_rotate last_kick_far game_over",
+)
+PieceGeometry = namedtuple("PieceGeometry", "rotations bounds profiles masks spawn preview")
+Placement = namedtuple("Placement", "shape rotation x y path t_spin hold")
+
+
+def _build_piece_masks(rotations, width=WIDTH):
+    # Row masks for each legal x position; a missing x means the piece hits a wall.
+    tables = []
+    for coords in rotations:
+        by_x = {}
+        min_x = min(c[0] for c in coords)
+        max_x = max(c[0] for c in coords)
+        for x in range(-min_x, width - max_x):
+            rows = {}
+            for bx, by in coords:
+                rows[by] = rows.get(by, 0) | (1 << (x + bx))
+            by_x[x] = tuple(sorted(rows.items()))
+        tables.append(by_x)
+    return tables
+
+
+def _build_preview(coords):
+    min_x = min(c[0] for c in coords)
+    max_x = max(c[0] for c in coords)
+    min_y = min(c[1] for c in coords)
+    max_y = max(c[1] for c in coords)
+    cells = set(coords)
+
+    lines = []
+    for y in range(min_y, max_y + 1):
+        row = "".join(BLOCK if (x, y) in cells else EMPTY for x in range(min_x, max_x + 1))
+        lines.append(row.rstrip() or EMPTY)
+    return tuple(lines)
+
+
+def _build_geometry(rotations, width=WIDTH):
+    rotations = tuple(tuple(coords) for coords in rotations)
+    bounds = []
+    profiles = []
+    for coords in rotations:
+        xs = [c[0] for c in coords]
+        ys = [c[1] for c in coords]
+        bounds.append((min(xs), max(xs), min(ys), max(ys)))
+        # (column offset, top cell dy, bottom cell dy) for each column the piece covers
+        columns = {}
+        for bx, by in coords:
+            top, bottom = columns.get(bx, (by, by))
+            columns[bx] = (min(top, by), max(bottom, by))
+        profiles.append(tuple((bx, top, bottom) for bx, (top, bottom) in sorted(columns.items())))
+    return PieceGeometry(
+        rotations=rotations,
+        bounds=tuple(bounds),
+        profiles=tuple(profiles),
+        masks=tuple(_build_piece_masks(rotations, width)),
+        spawn=(width // 2, 1),
+        preview=_build_preview(rotations[0]),
+    )
+
+
+def _all_rotations(cells):
+    # Quarter turns about (0, 0) (x right, y down), keeping only the distinct ones.
+    rotations = []
+    seen = set()
+    for _ in range(4):
+        min_x = min(x for x, _ in cells)
+        min_y = min(y for _, y in cells)
+        normalized = frozenset((x - min_x, y - min_y) for x, y in cells)
+        if normalized not in seen:
+            seen.add(normalized)
+            rotations.append(list(cells))
+        cells = [(-y, x) for x, y in cells]
+    return rotations
+
+
+PENTOMINOES = {
+    key: _all_rotations(cells)
+    for key, cells in {
+        "F5": [(0, -1), (1, -1), (-1, 0), (0, 0), (0, 1)],
+        "I5": [(0, -2), (0, -1), (0, 0), (0, 1), (0, 2)],
+        "L5": [(0, -2), (0, -1), (0, 0), (0, 1), (1, 1)],
+        "N5": [(1, -2), (1, -1), (0, -1), (0, 0), (0, 1)],
+        "P5": [(0, -1), (1, -1), (0, 0), (1, 0), (0, 1)],
+        "T5": [(-1, -1), (0, -1), (1, -1), (0, 0), (0, 1)],
+        "U5": [(-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)],
+        "V5": [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1)],
+        "W5": [(-1, -1), (-1, 0), (0, 0), (0, 1), (1, 1)],
+        "X5": [(0, -1), (-1, 0), (0, 0), (1, 0), (0, 1)],
+        "Y5": [(0, -2), (0, -1), (1, -1), (0, 0), (0, 1)],
+        "Z5": [(-1, -1), (0, -1), (0, 0), (0, 1), (1, 1)],
+    }.items()
+}
+
+# Offsets tried in order after any turn, for every piece and rotation state.
+DEFAULT_KICKS = ((0, 0), (-1, 0), (1, 0), (-2, 0), (2, 0))
+
+# SRS kicks per (from, to) state, as (dx, dy) with y down (the guideline tables, y flipped).
+# Quarter turns of J, L, S, T and Z share one table and I has its own; the guideline has no
+# half-turn kicks, so every piece uses the common SRS+ set for those.
+SRS_KICKS = {
+    (0, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (1, 0): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (1, 2): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (2, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (0, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+}
+SRS_I_KICKS = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),
+}
+SRS_HALF_TURN_KICKS = {
+    (0, 2): ((0, 0), (0, -1), (1, -1), (-1, -1), (1, 0), (-1, 0)),
+    (2, 0): ((0, 0), (0, 1), (-1, 1), (1, 1), (-1, 0), (1, 0)),
+    (1, 3): ((0, 0), (1, 0), (1, -2), (1, -1), (0, -2), (0, -1)),
+    (3, 1): ((0, 0), (-1, 0), (-1, -2), (-1, -1), (0, -2), (0, -1)),
+}
+# A quarter-turn T kick of (±1, ±2) always scores a full T-spin, even without both front corners.
+FAR_KICKS = frozenset((dx, dy) for dx in (-1, 1) for dy in (-2, 2))
+
+# Turn for each rotate action, in quarter turns clockwise.
+ROTATE_ACTIONS = {"rotate": 1, "rotate_ccw": -1, "rotate_180": 2}
+
+
+def _srs_kick_table(shapes):
+    # Flat {(piece, from, to): offsets} lookup for the four-state pieces; O never kicks.
+    table = {}
+    for key, rotations in shapes.items():
+        if len(rotations) != 4:
+            continue
+        quarter_turns = SRS_I_KICKS if key == "I" else SRS_KICKS
+        for (start, end), offsets in {**quarter_turns, **SRS_HALF_TURN_KICKS}.items():
+            table[(key, start, end)] = offsets
+    return table
+
+
+SRS_KICK_TABLE = _srs_kick_table(SHAPES)
+
+
+def _t_spin_fronts(rotations):
+    # For each T state, the two corners beside the cell it points with (the one without an
+    # opposite arm). Filling both makes a full T-spin; otherwise three corners are a mini.
+    fronts = []
+    for cells in rotations:
+        stem_x, stem_y = next((x, y) for x, y in cells if (x, y) != (0, 0) and (-x, -y) not in cells)
+        fronts.append(((-1, stem_y), (1, stem_y)) if stem_x == 0 else ((stem_x, -1), (stem_x, 1)))
+    return tuple(fronts)
+
+
+class Ruleset:
+    # Board size, piece set, kicks and scoring for one game variant. Every table the engine
+    # reads per move (piece geometry and masks, the full-row mask, kick offsets per rotation
+    # transition) is built here once and shared by all games using the ruleset.
+    def __init__(
+        self,
+        name="standard",
+        width=WIDTH,
+        height=HEIGHT,
+        shapes=None,
+        kicks=SRS_KICK_TABLE,
+        line_clear_scores=None,
+        t_spin_scores=None,
+        t_spin_mini_scores=None,
+        t_spin_minis=True,
+    ):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.shapes = dict(SHAPES if shapes is None else shapes)
+        self.shape_keys = tuple(self.shapes)
+        self.piece_codes = {key: code for code, key in enumerate(self.shape_keys)}
+        self.pieces = {key: _build_geometry(rotations, width) for key, rotations in self.shapes.items()}
+        self.full_mask = (1 << width) - 1
+        self.line_clear_scores = dict(LINE_CLEAR_SCORES if line_clear_scores is None else line_clear_scores)
+        self.t_spin_scores = dict(T_SPIN_SCORES if t_spin_scores is None else t_spin_scores)
+        self.t_spin_mini_scores = dict(T_SPIN_MINI_SCORES if t_spin_mini_scores is None else t_spin_mini_scores)
+        # Without minis every three-corner T-spin is a full one, as before SRS.
+        self.t_spin_minis = t_spin_minis
+        self.t_spin_fronts = _t_spin_fronts(self.shapes["T"]) if "T" in self.shapes else ()
+        # kicks is either one offset list for every turn or a {(piece, from, to): offsets} dict;
+        # transitions missing from the dict use DEFAULT_KICKS.
+        self.kicks = {}
+        for key, geometry in self.pieces.items():
+            count = len(geometry.rotations)
+            for rot in range(count):
+                for turn in ROTATE_ACTIONS.values():
+                    transition = (key, rot, (rot + turn) % count)
+                    offsets = kicks.get(transition, DEFAULT_KICKS) if isinstance(kicks, dict) else kicks
+                    self.kicks[transition] = tuple(offsets)
+        # How far a kick can lift a piece; the placement search widens its bounds by this much.
+        self.max_kick_rise = max([0] + [-dy for offsets in self.kicks.values() for _, dy in offsets])
+
+    def __repr__(self):
+        return f"Ruleset({self.name!r}, {self.width}x{self.height}, {len(self.shapes)} pieces)"
+
+
+DEFAULT_RULESET = Ruleset()
+RULESETS = {
+    "standard": DEFAULT_RULESET,
+    "pentomino": Ruleset(
+        "pentomino",
+        width=12,
+        height=24,
+        shapes={**SHAPES, **PENTOMINOES},
+        line_clear_scores={**LINE_CLEAR_SCORES, 5: 1200},
+    ),
+    "wide": Ruleset("wide", width=40, height=100),
+    "classic": Ruleset("classic", shapes=CLASSIC_SHAPES, kicks=DEFAULT_KICKS, t_spin_minis=False),
+}
+
+# Everything derived from SHAPES is computed once here and shared by the engine and renderer.
+PIECES = DEFAULT_RULESET.pieces
+
+
 class Tetris:
-    def __init__(self, options):
+    engine = "grid"
+
+    def __new__(cls, options=None, engine="grid", **kwargs):
+        if cls is Tetris:
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown engine: {engine}")
+            cls = ENGINES[engine]
+        return super().__new__(cls)
+
+    def __init__(self, options, engine="grid", persist=True, seed=None, ruleset=None):
         self.options = dict(options)
-        self.high_score = self.load_high_score()
+        if ruleset is None:
+            # Named rulesets can come through options, so replays and worker processes keep them.
+            name = self.options.get("ruleset", "standard")
+            if name not in RULESETS:
+                raise ValueError(f"Unknown ruleset: {name}")
+            ruleset = RULESETS[name]
+        self.ruleset = ruleset
+        # Read on every move, so kept as plain attributes.
+        self.width = self.ruleset.width
+        self.height = self.ruleset.height
+        self.pieces = self.ruleset.pieces
+        self.full_mask = self.ruleset.full_mask
+        self.persist = persist
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.high_score = self.load_high_score() if persist else 0
+        self._high_score_dirty = False
+        self._last_high_score_flush = time.monotonic()
+        self.renderer = DiffRenderer()
+        self.board_version = 0
+        self._ghost_key = None
         self.reset()
 
+    def _reset_board(self):
+        self.board = [[EMPTY for _ in range(self.width)] for _ in range(self.height)]
+        self._recount()
+
+    def _load_rows(self, rows):
+        self.board = [[BLOCK if row >> x & 1 else EMPTY for x in range(self.width)] for row in rows]
+        self._recount()
+
+    def _recount(self):
+        # row_fill[y] is the number of filled cells in row y and column_heights[x] the height of
+        # column x's top block above the floor. lock_piece keeps both current between recounts.
+        rows = self.board_rows()
+        self.board_version += 1
+        self.row_fill = [row.bit_count() for row in rows]
+        self._recount_heights(rows)
+
+    def _recount_heights(self, rows):
+        heights = [0] * self.width
+        seen = 0
+        for y, row in enumerate(rows):
+            new = row & ~seen
+            while new:
+                low = new & -new
+                heights[low.bit_length() - 1] = self.height - y
+                new ^= low
+            seen |= row
+            if seen == self.full_mask:
+                break
+        self.column_heights = heights
+
+    def _heights_after_clear(self, full):
+        # A full row covers every column, so each column drops by the number of cleared rows,
+        # except a column whose top block was in the highest cleared row: it is rescanned from
+        # that row down, as everything above it in that column was empty.
+        top_row = min(full)
+        lines = len(full)
+        heights = self.column_heights
+        for x in range(self.width):
+            if heights[x] > self.height - top_row:
+                heights[x] -= lines
+            else:
+                board = self.board
+                y = top_row
+                while y < self.height and board[y][x] == EMPTY:
+                    y += 1
+                heights[x] = self.height - y
+
+    def _is_blocked(self, x, y):
+        if x < 0 or x >= self.width or y >= self.height:
+            return True
+        return y >= 0 and self.board[y][x] != EMPTY
+
+    def board_rows(self):
+        return [sum(1 << x for x, cell in enumerate(row) if cell != EMPTY) for row in self.board]
+
+    def _place_piece(self):
+        # Returns the rows the piece landed in, top to bottom.
+        touched = set()
+        heights = self.column_heights
+        for dx, dy in self.get_current_coords():
+            py, px = self.y + dy, self.x + dx
+            if 0 <= py < self.height and 0 <= px < self.width:
+                # A piece spawned into the stack at game over can overlap filled cells.
+                if self.board[py][px] == EMPTY:
+                    self.row_fill[py] += 1
+                self.board[py][px] = BLOCK
+                if heights[px] < self.height - py:
+                    heights[px] = self.height - py
+                touched.add(py)
+        return sorted(touched)
+
     def reset(self):
-        self.board = [[EMPTY for _ in range(WIDTH)] for _ in range(HEIGHT)]
+        self._reset_board()
         self.score = 0
         self.level = 1
         self.lines_cleared = 0
+        self.pieces_placed = 0
+        self.last_clear = (0, None)
         self.base_fall_speed = DIFFICULTY_SPEEDS.get(
             self.options.get("difficulty", "normal"),
             START_FALL_SPEED,
@@ -934,29 +877,36 @@ class Tetris:
         self.combo = -1
         self.back_to_back = False
         self.last_move_was_rotate = False
+        self.last_kick_far = False
 
+        self.rng = random.Random(self.seed)
+        self.bags_drawn = 0
         self.bag = []
         self.next_queue = []
         self._fill_next_queue(PREVIEW_COUNT + 1)
 
         self.shape_key = None
         self.rotation = 0
-        self.x = WIDTH // 2
+        self.x = self.width // 2
         self.y = 1
-        self._last_rendered_lines = 0
+        self.renderer.invalidate()
         self.spawn_piece()
 
     def load_high_score(self):
         return int(load_scores_data().get("high_score", 0))
 
     def save_high_score(self):
-        data = load_scores_data()
-        data["high_score"] = int(self.high_score)
-        save_scores_data(data)
+        # Flushes the in-memory record; called on game over, quit, restart and by the timer.
+        self._last_high_score_flush = time.monotonic()
+        if not self.persist or not self._high_score_dirty:
+            return
+        score_store.raise_high_score(self.high_score)
+        self._high_score_dirty = False
 
     def _refill_bag(self):
-        pieces = list(SHAPES.keys())
-        random.shuffle(pieces)
+        pieces = list(self.ruleset.shape_keys)
+        self.rng.shuffle(pieces)
+        self.bags_drawn += 1
         self.bag.extend(pieces)
 
     def _pop_from_bag(self):
@@ -972,8 +922,7 @@ class Tetris:
         self._fill_next_queue(PREVIEW_COUNT + 1)
         self.shape_key = self.next_queue.pop(0)
         self.rotation = 0
-        self.x = WIDTH // 2
-        self.y = 1
+        self.x, self.y = self.pieces[self.shape_key].spawn
         self.hold_used = False
         self.last_move_was_rotate = False
         self._fill_next_queue(PREVIEW_COUNT + 1)
@@ -981,109 +930,199 @@ class Tetris:
             self.game_over = True
             self.update_high_score()
 
+    def snapshot(self):
+        # Immutable, hashable copy of the game state only (no options, renderer or score store).
+        # The randomizer is stored as the number of bags drawn from the seed.
+        return GameState(
+            self.seed,
+            tuple(self.board_rows()),
+            self.shape_key,
+            self.rotation,
+            self.x,
+            self.y,
+            self.held_piece,
+            self.hold_used,
+            tuple(self.next_queue),
+            tuple(self.bag),
+            self.bags_drawn,
+            self.score,
+            self.level,
+            self.lines_cleared,
+            self.pieces_placed,
+            self.combo,
+            self.back_to_back,
+            self.last_move_was_rotate,
+            self.last_kick_far,
+            self.game_over,
+        )
+
+    def restore(self, state):
+        if state.seed != self.seed or state.bags_drawn != self.bags_drawn:
+            self.seed = state.seed
+            self.rng = random.Random(state.seed)
+            pieces = list(self.ruleset.shape_keys)
+            for _ in range(state.bags_drawn):
+                self.rng.shuffle(pieces)
+            self.bags_drawn = state.bags_drawn
+        self._load_rows(state.rows)
+        self.shape_key = state.shape_key
+        self.rotation = state.rotation
+        self.x = state.x
+        self.y = state.y
+        self.held_piece = state.held_piece
+        self.hold_used = state.hold_used
+        self.next_queue = list(state.next_queue)
+        self.bag = list(state.bag)
+        self.score = state.score
+        self.level = state.level
+        self.lines_cleared = state.lines_cleared
+        self.pieces_placed = state.pieces_placed
+        self.combo = state.combo
+        self.back_to_back = state.back_to_back
+        self.last_move_was_rotate = state.last_move_was_rotate
+        self.last_kick_far = state.last_kick_far
+        self.game_over = state.game_over
+        self.fall_speed = max(MIN_FALL_SPEED, self.base_fall_speed * (0.85 ** (self.level - 1)))
+        self.renderer.invalidate()
+
+    def to_bytes(self):
+        return encode_state(self.snapshot(), self.ruleset)
+
+    @classmethod
+    def from_bytes(cls, data, options=None, engine="grid", ruleset=None):
+        game = cls(DEFAULT_OPTIONS if options is None else options, engine=engine, persist=False, ruleset=ruleset)
+        game.restore(decode_state(data, ruleset=game.ruleset))
+        return game
+
+    def clone(self):
+        # A detached copy for what-if play: same state and randomizer, never writes scores.
+        other = copy.copy(self)
+        # Methods wrapped on the instance (Instrumentation.attach) are bound to this game.
+        for name in [name for name in vars(other) if callable(getattr(type(other), name, None))]:
+            del other.__dict__[name]
+        other.options = dict(self.options)
+        other.persist = False
+        other._high_score_dirty = False
+        other.renderer = DiffRenderer()
+        other.rng = random.Random()
+        other.rng.setstate(self.rng.getstate())
+        other.restore(self.snapshot())
+        return other
+
     def update_high_score(self):
         if self.score > self.high_score:
             self.high_score = self.score
+            self._high_score_dirty = True
+        if self._high_score_dirty and (
+            self.game_over or time.monotonic() - self._last_high_score_flush >= HIGH_SCORE_FLUSH_INTERVAL
+        ):
             self.save_high_score()
 
     def get_current_coords(self, rotation=None):
         if rotation is None:
             rotation = self.rotation
-        rotations = SHAPES[self.shape_key]
+        rotations = self.pieces[self.shape_key].rotations
         return rotations[rotation % len(rotations)]
 
     def draw_piece_preview(self, shape_key):
         if shape_key is None:
             return [tr(self.options, "empty")]
-
-        coords = SHAPES[shape_key][0]
-        min_x = min(c[0] for c in coords)
-        max_x = max(c[0] for c in coords)
-        min_y = min(c[1] for c in coords)
-        max_y = max(c[1] for c in coords)
-
-        lines = []
-        for y in range(min_y, max_y + 1):
-            row = ""
-            for x in range(min_x, max_x + 1):
-                row += BLOCK if (x, y) in coords else EMPTY
-            lines.append(row.rstrip() or EMPTY)
-        return lines
+        return self.pieces[shape_key].preview
 
     def get_ghost_y(self):
+        # While the piece is above the stack it lands where its bottom profile first meets a
+        # column top. That row only changes with the piece, rotation, x or the board.
+        key = (self.shape_key, self.rotation, self.x, self.board_version)
+        if key != self._ghost_key:
+            self._ghost_key = key
+            profiles = self.pieces[self.shape_key].profiles
+            profile = profiles[self.rotation % len(profiles)]
+            heights = self.column_heights
+            self._surface_y = min(self.height - heights[self.x + bx] - 1 - bottom for bx, _, bottom in profile)
+        if self.y <= self._surface_y:
+            return self._surface_y
+        # Tucked under an overhang (or overlapping at game over): step down as before.
+        return self._drop_y()
+
+    def _drop_y(self):
         ghost_y = self.y
         while not self.check_collision(0, ghost_y - self.y + 1, self.rotation):
             ghost_y += 1
         return ghost_y
 
-    def draw(self, paused=False, show_controls=False, status_message=None):
-        lines = []
-
-        lines.append(
-            tr(
-                self.options,
-                "game_header",
+    def render_lines(self, paused=False, show_controls=False, status_message=None):
+        texts = get_catalog(self.options.get("language", "en"))
+        lines = [
+            texts["game_header"].format(
                 score=self.score,
                 high=self.high_score,
                 level=self.level,
                 lines=self.lines_cleared,
             )
-        )
+        ]
 
-        held_lines = self.draw_piece_preview(self.held_piece)
-        lines.append(tr(self.options, "hold"))
-        for line in held_lines:
-            lines.append(line)
+        lines.append(texts["hold"])
+        lines.extend(self.draw_piece_preview(self.held_piece))
 
-        lines.append(tr(self.options, "next"))
-        for i, piece in enumerate(self.next_queue[:PREVIEW_COUNT], start=1):
-            lines.append(f"{i}.")
-            for line in self.draw_piece_preview(piece):
-                lines.append(line)
+        lines.append(texts["next"])
+        for label, piece in zip(PREVIEW_LABELS, self.next_queue[:PREVIEW_COUNT]):
+            lines.append(label)
+            lines.extend(self.draw_piece_preview(piece))
 
-        display_board = [row[:] for row in self.board]
+        board = self.board
+        overlay = {}
 
         if self.options.get("show_ghost", True):
             ghost_y = self.get_ghost_y()
             for dx, dy in self.get_current_coords():
                 py, px = ghost_y + dy, self.x + dx
-                if 0 <= py < HEIGHT and 0 <= px < WIDTH and display_board[py][px] == EMPTY:
-                    display_board[py][px] = GHOST
+                if 0 <= py < self.height and 0 <= px < self.width and board[py][px] == EMPTY:
+                    overlay.setdefault(py, {})[px] = GHOST
 
         for dx, dy in self.get_current_coords():
             py, px = self.y + dy, self.x + dx
-            if 0 <= py < HEIGHT and 0 <= px < WIDTH:
-                display_board[py][px] = BLOCK
-
-        for row in display_board:
+            if 0 <= py < self.height and 0 <= px < self.width:
+                overlay.setdefault(py, {})[px] = BLOCK
+
+        # Only rows under the piece or its ghost are copied.
+        for py, row in enumerate(board):
+            cells = overlay.get(py)
+            if cells:
+                row = row[:]
+                for px, cell in cells.items():
+                    row[px] = cell
             lines.append("|" + "".join(row) + "|")
-        lines.append("-" * (WIDTH * 2 + 2))
+        lines.append("-" * (self.width * 2 + 2))
 
         if status_message:
             lines.append(status_message)
         elif paused:
-            lines.append(tr(self.options, "paused"))
+            lines.append(texts["paused"])
         else:
             if show_controls:
-                lines.append(tr(self.options, "controls_1"))
-                lines.append(tr(self.options, "controls_2"))
+                lines.append(texts["controls_1"])
+                lines.append(texts["controls_rotate"])
+                lines.append(texts["controls_2"])
             else:
-                lines.append(tr(self.options, "controls_hint"))
+                lines.append(texts["controls_hint"])
+        return lines
 
-        # Redraw in place without full-screen erase to avoid flicker.
-        rendered = "\033[H" + "\n".join(f"{line}\033[K" for line in lines)
-        extra = self._last_rendered_lines - len(lines)
-        if extra > 0:
-            rendered += "\n" + "\n".join("\033[K" for _ in range(extra))
-        print(rendered, end="")
-        self._last_rendered_lines = len(lines)
+    def draw(self, paused=False, show_controls=False, status_message=None):
+        self.renderer.render(self.render_lines(paused, show_controls, status_message))
 
     def check_collision(self, dx, dy, rot):
-        for bx, by in self.get_current_coords(rot):
-            nx, ny = self.x + bx + dx, self.y + by + dy
-            if nx < 0 or nx >= WIDTH or ny >= HEIGHT:
-                return True
-            if ny >= 0 and self.board[ny][nx] != EMPTY:
+        return self.collides(self.shape_key, rot, self.x + dx, self.y + dy)
+
+    def collides(self, shape_key, rot, x, y):
+        geometry = self.pieces[shape_key]
+        rot %= len(geometry.rotations)
+        min_x, max_x, _, max_y = geometry.bounds[rot]
+        if x + min_x < 0 or x + max_x >= self.width or y + max_y >= self.height:
+            return True
+        board = self.board
+        for bx, by in geometry.rotations[rot]:
+            ny = y + by
+            if ny >= 0 and board[ny][x + bx] != EMPTY:
                 return True
         return False
 
@@ -1103,43 +1142,54 @@ class Tetris:
 
     def lock_piece(self):
         t_spin = self.is_t_spin()
-
-        for dx, dy in self.get_current_coords():
-            py, px = self.y + dy, self.x + dx
-            if 0 <= py < HEIGHT and 0 <= px < WIDTH:
-                self.board[py][px] = BLOCK
-
-        lines = self.clear_lines()
+        touched = self._place_piece()
+        self.board_version += 1
+        self.pieces_placed += 1
+        lines = self.clear_lines(touched)
+        self.last_clear = (lines, t_spin)
         self.apply_scoring(lines, t_spin=t_spin)
         self.spawn_piece()
 
     def is_t_spin(self):
+        # None, T_SPIN_MINI or T_SPIN_FULL for the piece about to lock.
         if self.shape_key != "T" or not self.last_move_was_rotate:
-            return False
+            return None
+        return self._t_spin_kind(self.rotation, self.x, self.y, self.last_kick_far)
 
-        cx, cy = self.x, self.y
+    def _t_spin_kind(self, rot, cx, cy, far_kick=False):
         occupied_corners = 0
         for ox, oy in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
-            px, py = cx + ox, cy + oy
-            if px < 0 or px >= WIDTH or py >= HEIGHT:
-                occupied_corners += 1
-            elif py >= 0 and self.board[py][px] != EMPTY:
+            if self._is_blocked(cx + ox, cy + oy):
                 occupied_corners += 1
-
-        return occupied_corners >= 3
-
-    def clear_lines(self):
-        new_board = [row for row in self.board if EMPTY in row]
-        lines_cleared = HEIGHT - len(new_board)
-        for _ in range(lines_cleared):
-            new_board.insert(0, [EMPTY for _ in range(WIDTH)])
-        self.board = new_board
+        if occupied_corners < 3:
+            return None
+
+        fronts = self.ruleset.t_spin_fronts[rot]
+        if far_kick or not self.ruleset.t_spin_minis or all(self._is_blocked(cx + ox, cy + oy) for ox, oy in fronts):
+            return T_SPIN_FULL
+        return T_SPIN_MINI
+
+    def clear_lines(self, rows=None):
+        # Only rows the last piece touched can have filled up; None checks the whole board.
+        candidates = range(self.height) if rows is None else rows
+        full = [y for y in candidates if self.row_fill[y] == self.width]
+        if not full:
+            return 0
+        board, row_fill = self.board, self.row_fill
+        for y in sorted(full, reverse=True):
+            del board[y]
+            del row_fill[y]
+        lines_cleared = len(full)
+        board[:0] = [[EMPTY for _ in range(self.width)] for _ in range(lines_cleared)]
+        row_fill[:0] = [0] * lines_cleared
+        self._heights_after_clear(full)
+        self.board_version += 1
         return lines_cleared
 
-    def apply_scoring(self, lines, t_spin=False):
+    def apply_scoring(self, lines, t_spin=None):
         if t_spin:
-            t_spin_scores = {0: 400, 1: 800, 2: 1200, 3: 1600}
-            base = t_spin_scores.get(lines, 0) * self.level
+            scores = self.ruleset.t_spin_mini_scores if t_spin == T_SPIN_MINI else self.ruleset.t_spin_scores
+            base = scores.get(lines, 0) * self.level
 
             if lines > 0 and self.back_to_back:
                 base = int(base * 1.5)
@@ -1165,9 +1215,10 @@ class Tetris:
             return
 
         self.combo += 1
-        base = LINE_CLEAR_SCORES.get(lines, 0) * self.level
+        base = self.ruleset.line_clear_scores.get(lines, 0) * self.level
 
-        if lines == 4:
+        # Four or more lines at once (a Tetris, or five with pentominoes) builds back-to-back.
+        if lines >= 4:
             if self.back_to_back:
                 base = int(base * 1.5)
             self.back_to_back = True
@@ -1183,26 +1234,157 @@ class Tetris:
         self.update_high_score()
 
     def hard_drop(self):
-        drop_distance = 0
-        while not self.check_collision(0, 1, self.rotation):
-            self.y += 1
-            drop_distance += 1
+        ghost_y = self.get_ghost_y()
+        drop_distance = ghost_y - self.y
+        self.y = ghost_y
 
         self.last_move_was_rotate = False
         self.score += drop_distance * 2
         self.update_high_score()
         self.lock_piece()
 
-    def rotate(self):
-        new_rot = (self.rotation + 1) % len(SHAPES[self.shape_key])
+    def rotate(self, turn=1):
+        # turn: 1 clockwise, -1 counter-clockwise, 2 half turn
+        target = self._rotation_target(self.shape_key, self.rotation, self.x, self.y, turn)
+        if target is None:
+            return False
+        self.rotation, self.x, self.y, self.last_kick_far = target
+        self.last_move_was_rotate = True
+        return True
 
-        for kick_x in (0, -1, 1, -2, 2):
-            if not self.check_collision(kick_x, 0, new_rot):
-                self.x += kick_x
-                self.rotation = new_rot
-                self.last_move_was_rotate = True
-                return True
-        return False
+    def _rotation_target(self, shape_key, rot, x, y, turn=1):
+        # (rotation, x, y, far kick) after the first kick that fits, or None.
+        new_rot = (rot + turn) % len(self.pieces[shape_key].rotations)
+        for kick in self.ruleset.kicks[(shape_key, rot, new_rot)]:
+            kick_x, kick_y = kick
+            if not self.collides(shape_key, new_rot, x + kick_x, y + kick_y):
+                return new_rot, x + kick_x, y + kick_y, turn % 2 == 1 and kick in FAR_KICKS
+        return None
+
+    def enumerate_placements(self, use_hold=False):
+        # Breadth-first search over (rotation, x, y, spun) from the spawn/current state, with
+        # left/right/down edges, an edge per rotate action and a hard_drop shortcut. Each distinct
+        # set of resting cells is reported once per T-spin kind (none, mini, full) with its
+        # shortest path.
+        if use_hold:
+            if self.hold_used:
+                return []
+            shape_key = self.held_piece if self.held_piece is not None else self.next_queue[0]
+            x, y = self.pieces[shape_key].spawn
+            return self._placements_from(shape_key, 0, x, y, ["hold"], True)
+        return self._placements_from(self.shape_key, self.rotation, self.x, self.y, [], False)
+
+    def _placements_from(self, shape_key, rot, x, y, prefix, use_hold):
+        if shape_key is None or self.collides(shape_key, rot, x, y):
+            return []
+
+        rotations = self.pieces[shape_key].rotations
+        n_rot = len(rotations)
+        rot %= n_rot
+        can_spin = shape_key == "T"
+        # One edge per distinct turn: two-state pieces skip the half turn, O does not turn.
+        turns = {}
+        for action, turn in ROTATE_ACTIONS.items():
+            if turn % n_rot:
+                turns.setdefault(turn % n_rot, (action, turn))
+        # Room around the board for pieces poking past the walls or lifted by kicks.
+        margin = 3 + self.ruleset.max_kick_rise
+        x_span, y_span = self.width + 2 * margin, self.height + 2 * margin
+        # spun: 0 = not spun, 1 = rotated into place, 2 = rotated with a far kick
+        visited = bytearray(n_rot * x_span * y_span * 3)
+        # 0 = not probed yet, 1 = free, 2 = blocked
+        probes = bytearray(n_rot * x_span * y_span)
+        collides = self.collides
+
+        def free(s_rot, s_x, s_y):
+            if not (-margin <= s_x < self.width + margin and -margin <= s_y < self.height + margin):
+                return not collides(shape_key, s_rot, s_x, s_y)
+            i = (s_rot * y_span + s_y + margin) * x_span + s_x + margin
+            probe = probes[i]
+            if not probe:
+                probe = probes[i] = 2 if collides(shape_key, s_rot, s_x, s_y) else 1
+            return probe == 1
+
+        def index(state):
+            s_rot, s_x, s_y, spun = state
+            return (((s_rot * y_span) + s_y + margin) * x_span + s_x + margin) * 3 + spun
+
+        # Above the stack only the walls matter, so the rows between the start row and the
+        # lowest air row behave alike and are crossed with a single multi-row "down" edge.
+        top = self.height - max(self.column_heights)
+        air_y = top - 2 - max(bounds[3] for bounds in self.pieces[shape_key].bounds)
+
+        start = (rot, x, y, 0)
+        visited[index(start)] = 1
+        parents = {start: None}
+        queue = deque([start])
+        landing = {}
+        dropped = set()
+        found = {}
+
+        def path_to(state, last_action):
+            chunks = [(last_action,)]
+            while parents[state] is not None:
+                state, actions = parents[state]
+                chunks.append(actions)
+            return prefix + [action for actions in reversed(chunks) for action in actions]
+
+        def add_placement(state, s_y, spun, last_action):
+            s_rot, s_x = state[0], state[1]
+            cells = tuple(sorted((s_x + bx, s_y + by) for bx, by in rotations[s_rot]))
+            t_spin = self._t_spin_kind(s_rot, s_x, s_y, spun == 2) if spun else None
+            key = (cells, t_spin)
+            if key not in found:
+                found[key] = Placement(shape_key, s_rot, s_x, s_y, path_to(state, last_action), t_spin, use_hold)
+
+        while queue:
+            state = queue.popleft()
+            s_rot, s_x, s_y, spun = state
+            can_fall = free(s_rot, s_x, s_y + 1)
+
+            if not can_fall:
+                # Resting already: a failed soft drop locks without clearing the spin flag.
+                add_placement(state, s_y, spun, "down")
+            else:
+                # Landing rows are memoised along each column so every cell is probed once.
+                column = (s_rot, s_x)
+                drop_y = s_y
+                passed = []
+                while (column, drop_y) not in landing and free(s_rot, s_x, drop_y + 1):
+                    passed.append(drop_y)
+                    drop_y += 1
+                drop_y = landing.get((column, drop_y), drop_y)
+                for passed_y in passed:
+                    landing[(column, passed_y)] = drop_y
+                if (column, drop_y) not in dropped:
+                    dropped.add((column, drop_y))
+                    add_placement(state, drop_y, 0, "hard_drop")
+
+            neighbours = []
+            if free(s_rot, s_x - 1, s_y):
+                neighbours.append(((s_rot, s_x - 1, s_y, 0), ("left",)))
+            if free(s_rot, s_x + 1, s_y):
+                neighbours.append(((s_rot, s_x + 1, s_y, 0), ("right",)))
+            if s_y < air_y:
+                neighbours.append(((s_rot, s_x, air_y, 0), ("down",) * (air_y - s_y)))
+            elif can_fall:
+                neighbours.append(((s_rot, s_x, s_y + 1, 0), ("down",)))
+            for action, turn in turns.values():
+                target = self._rotation_target(shape_key, s_rot, s_x, s_y, turn)
+                if target is not None:
+                    spin = (2 if target[3] else 1) if can_spin else 0
+                    neighbours.append(((target[0], target[1], target[2], spin), (action,)))
+
+            for next_state, actions in neighbours:
+                if next_state[2] < -margin:
+                    continue
+                i = index(next_state)
+                if not visited[i]:
+                    visited[i] = 1
+                    parents[next_state] = (state, actions)
+                    queue.append(next_state)
+
+        return list(found.values())
 
     def hold_piece(self):
         if self.hold_used:
@@ -1215,8 +1397,7 @@ class Tetris:
         else:
             self.shape_key, self.held_piece = self.held_piece, current
             self.rotation = 0
-            self.x = WIDTH // 2
-            self.y = 1
+            self.x, self.y = self.pieces[self.shape_key].spawn
             self.last_move_was_rotate = False
             if self.check_collision(0, 0, self.rotation):
                 self.game_over = True
@@ -1225,16 +1406,302 @@ class Tetris:
         self.hold_used = True
         return True
 
+    def add_garbage(self, count, hole):
+        # Versus play: pushes the stack up by `count` rows that are full except at column `hole`.
+        # Blocks pushed off the top, or a falling piece now overlapping the stack, end the game.
+        if count <= 0:
+            return
+        count = min(count, self.height)
+        rows = self.board_rows()
+        if any(rows[:count]):
+            self.game_over = True
+        garbage = self.full_mask & ~(1 << hole)
+        self._load_rows(rows[count:] + [garbage] * count)
+        if not self.game_over and self.check_collision(0, 0, self.rotation):
+            self.game_over = True
+        if self.game_over:
+            self.update_high_score()
+
+
+class BitboardTetris(Tetris):
+    # Same rules as Tetris, but each row is an int bitmask (bit x = column x).
+    engine = "bitboard"
+
+    @property
+    def board(self):
+        return [[BLOCK if row >> x & 1 else EMPTY for x in range(self.width)] for row in self.rows]
+
+    def _reset_board(self):
+        self.rows = [0] * self.height
+        self._recount()
+
+    def _load_rows(self, rows):
+        self.rows = list(rows)
+        self._recount()
+
+    def board_rows(self):
+        return list(self.rows)
+
+    def _is_blocked(self, x, y):
+        if x < 0 or x >= self.width or y >= self.height:
+            return True
+        return y >= 0 and bool(self.rows[y] >> x & 1)
+
+    def _heights_after_clear(self, full):
+        top_row = min(full)
+        lines = len(full)
+        heights = self.column_heights
+        pending = 0
+        for x in range(self.width):
+            if heights[x] > self.height - top_row:
+                heights[x] -= lines
+            else:
+                pending |= 1 << x
+        rows = self.rows
+        y = top_row
+        while pending and y < self.height:
+            found = rows[y] & pending
+            pending ^= found
+            while found:
+                low = found & -found
+                heights[low.bit_length() - 1] = self.height - y
+                found ^= low
+            y += 1
+        while pending:
+            low = pending & -pending
+            heights[low.bit_length() - 1] = 0
+            pending ^= low
+
+    def _place_piece(self):
+        rows, row_fill, heights = self.rows, self.row_fill, self.column_heights
+        masks = self.pieces[self.shape_key].masks
+        touched = []
+        for dy, mask in masks[self.rotation % len(masks)][self.x]:
+            py = self.y + dy
+            if 0 <= py < self.height:
+                row_fill[py] += (mask & ~rows[py]).bit_count()
+                rows[py] |= mask
+                touched.append(py)
+                while mask:
+                    low = mask & -mask
+                    x = low.bit_length() - 1
+                    if heights[x] < self.height - py:
+                        heights[x] = self.height - py
+                    mask ^= low
+        return sorted(touched)
+
+    def check_collision(self, dx, dy, rot):
+        return self.collides(self.shape_key, rot, self.x + dx, self.y + dy)
+
+    def collides(self, shape_key, rot, x, y):
+        masks = self.pieces[shape_key].masks
+        row_masks = masks[rot % len(masks)].get(x)
+        if row_masks is None:
+            return True
+        rows = self.rows
+        for by, mask in row_masks:
+            ny = y + by
+            if ny >= self.height:
+                return True
+            if ny >= 0 and rows[ny] & mask:
+                return True
+        return False
+
+    def _drop_y(self):
+        masks = self.pieces[self.shape_key].masks
+        row_masks = masks[self.rotation % len(masks)][self.x]
+        rows = self.rows
+        ghost_y = self.y
+        while True:
+            y = ghost_y + 1
+            for by, mask in row_masks:
+                ny = y + by
+                if ny >= self.height or (ny >= 0 and rows[ny] & mask):
+                    return ghost_y
+            ghost_y = y
+
+    def clear_lines(self, rows=None):
+        candidates = range(self.height) if rows is None else rows
+        full = [y for y in candidates if self.rows[y] == self.full_mask]
+        if not full:
+            return 0
+        board, row_fill = self.rows, self.row_fill
+        for y in sorted(full, reverse=True):
+            del board[y]
+            del row_fill[y]
+        lines_cleared = len(full)
+        board[:0] = [0] * lines_cleared
+        row_fill[:0] = [0] * lines_cleared
+        self._heights_after_clear(full)
+        self.board_version += 1
+        return lines_cleared
+
+
+ENGINES = {
+    "grid": Tetris,
+    "bitboard": BitboardTetris,
+}
+
+
+# Packed game states: a fixed header, the preview queue and bag, then the board as width x height
+# bits (row y in bits y*width .. y*width+width-1). Sizes and piece codes come from the ruleset,
+# which the reader must know. A delta carries the header, the queue and bag
+# only if they changed, and only the rows that changed since the previous state.
+STATE_FULL = 1
+STATE_DELTA = 2
+STATE_HEADER = struct.Struct(">BQIIHIIhBBBbbB")
+SAME_PIECES_FLAG = 16
+FAR_KICK_FLAG = 32
+NO_PIECE = 0xFF
+
+
+def _encode_state_header(kind, state, codes, same_pieces=False):
+    flags = state.hold_used | state.back_to_back << 1 | state.last_move_was_rotate << 2 | state.game_over << 3
+    if state.last_kick_far:
+        flags |= FAR_KICK_FLAG
+    if same_pieces:
+        flags |= SAME_PIECES_FLAG
+    out = bytearray(STATE_HEADER.pack(
+        kind,
+        state.seed,
+        state.bags_drawn,
+        state.score,
+        state.level,
+        state.lines_cleared,
+        state.pieces_placed,
+        state.combo,
+        flags,
+        NO_PIECE if state.shape_key is None else codes[state.shape_key],
+        state.rotation,
+        state.x,
+        state.y,
+        NO_PIECE if state.held_piece is None else codes[state.held_piece],
+    ))
+    if not same_pieces:
+        for pieces in (state.next_queue, state.bag):
+            out.append(len(pieces))
+            out += bytes(codes[key] for key in pieces)
+    return out
+
+
+def _decode_state_header(data, keys, previous=None):
+    (kind, seed, bags_drawn, score, level, lines_cleared, pieces_placed, combo, flags,
+     shape, rotation, x, y, held) = STATE_HEADER.unpack_from(data)
+    pos = STATE_HEADER.size
+    if flags & SAME_PIECES_FLAG:
+        if previous is None:
+            raise ValueError("State delta needs the previous state")
+        pieces = [previous.next_queue, previous.bag]
+    else:
+        pieces = []
+        for _ in range(2):
+            count = data[pos]
+            pieces.append(tuple(keys[code] for code in data[pos + 1:pos + 1 + count]))
+            pos += 1 + count
+    fields = {
+        "seed": seed,
+        "shape_key": None if shape == NO_PIECE else keys[shape],
+        "rotation": rotation,
+        "x": x,
+        "y": y,
+        "held_piece": None if held == NO_PIECE else keys[held],
+        "hold_used": bool(flags & 1),
+        "next_queue": pieces[0],
+        "bag": pieces[1],
+        "bags_drawn": bags_drawn,
+        "score": score,
+        "level": level,
+        "lines_cleared": lines_cleared,
+        "pieces_placed": pieces_placed,
+        "combo": combo,
+        "back_to_back": bool(flags & 2),
+        "last_move_was_rotate": bool(flags & 4),
+        "last_kick_far": bool(flags & FAR_KICK_FLAG),
+        "game_over": bool(flags & 8),
+    }
+    return kind, fields, pos
+
+
+def encode_state(state, ruleset=None):
+    ruleset = DEFAULT_RULESET if ruleset is None else ruleset
+    board = 0
+    for y, row in enumerate(state.rows):
+        board |= row << (y * ruleset.width)
+    board_bytes = (ruleset.width * ruleset.height + 7) // 8
+    return bytes(_encode_state_header(STATE_FULL, state, ruleset.piece_codes) + board.to_bytes(board_bytes, "big"))
+
+
+def encode_state_delta(previous, current, ruleset=None):
+    ruleset = DEFAULT_RULESET if ruleset is None else ruleset
+    same_pieces = previous.next_queue == current.next_queue and previous.bag == current.bag
+    out = _encode_state_header(STATE_DELTA, current, ruleset.piece_codes, same_pieces)
+    row_bytes = (ruleset.width + 7) // 8
+    changed = 0
+    rows = bytearray()
+    for y, (old, row) in enumerate(zip(previous.rows, current.rows)):
+        if old != row:
+            changed |= 1 << y
+            rows += row.to_bytes(row_bytes, "big")
+    out += changed.to_bytes((ruleset.height + 7) // 8, "big")
+    out += rows
+    return bytes(out)
+
+
+def decode_state(data, previous=None, ruleset=None):
+    # Full states stand alone; a delta is applied on top of `previous`.
+    ruleset = DEFAULT_RULESET if ruleset is None else ruleset
+    width, height = ruleset.width, ruleset.height
+    kind, fields, pos = _decode_state_header(data, ruleset.shape_keys, previous)
+    if kind == STATE_FULL:
+        board = int.from_bytes(data[pos:pos + (width * height + 7) // 8], "big")
+        rows = tuple(board >> (y * width) & ruleset.full_mask for y in range(height))
+    elif kind == STATE_DELTA:
+        if previous is None:
+            raise ValueError("State delta needs the previous state")
+        changed_bytes = (height + 7) // 8
+        changed = int.from_bytes(data[pos:pos + changed_bytes], "big")
+        pos += changed_bytes
+        row_bytes = (width + 7) // 8
+        rows = list(previous.rows)
+        for y in range(height):
+            if changed >> y & 1:
+                rows[y] = int.from_bytes(data[pos:pos + row_bytes], "big")
+                pos += row_bytes
+        rows = tuple(rows)
+    else:
+        raise ValueError("Not a Tetris84 game state")
+    return GameState(rows=rows, **fields)
+
 
 def clear_screen():
     print("\033[2J\033[H", end="")
 
 
+_catalog_language = None
+_catalog = {}
+
+
+def _read_catalog(code):
+    try:
+        return json.loads((LANG_DIR / f"{code}.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def get_catalog(language):
+    # Only the active language is kept in memory, with English filled in for missing keys.
+    global _catalog_language, _catalog
+    if language != _catalog_language:
+        catalog = _read_catalog("en")
+        if language != "en":
+            catalog.update(_read_catalog(language))
+        _catalog_language, _catalog = language, catalog
+    return _catalog
+
+
 def tr(options, key, **kwargs):
-    lang = options.get("language", "en")
-    language_pack = TEXTS.get(lang, TEXTS["en"])
-    template = language_pack.get(key, TEXTS["en"].get(key, key))
-    return template.format(**kwargs)
+    template = get_catalog(options.get("language", "en")).get(key, key)
+    return template.format(**kwargs) if kwargs else template
 
 
 def language_label(options, code):
@@ -1387,100 +1854,1212 @@ def show_leaderboard(options):
     input(tr(options, "press_enter"))
 
 
-def prompt_for_leaderboard_initials(options, score):
+def prompt_for_leaderboard_initials(options, score, **details):
     if not score_qualifies_for_leaderboard(score):
         return
     clear_screen()
     print(tr(options, "leaderboard_title"))
     initials = input(tr(options, "initials_prompt")).strip()
     initials = _sanitize_initials(initials)
-    add_leaderboard_entry(initials, score)
+    add_leaderboard_entry(initials, score, **details)
     print(tr(options, "initials_saved", initials=initials, score=score))
     input(tr(options, "press_enter"))
 
 
-def run_game(options):
-    game = Tetris(options)
+class KeyboardInput:
+    interactive = True
+    # (key, action, (first repeat delay, repeat interval) or None for one-shot keys)
+    KEYS = (
+        ("q", "quit", None),
+        ("r", "restart", None),
+        ("p", "pause", None),
+        ("h", "toggle_controls", None),
+        ("left", "left", (DAS_DELAY, ARR_INTERVAL)),
+        ("right", "right", (DAS_DELAY, ARR_INTERVAL)),
+        ("down", "down", (SOFT_DROP_INTERVAL, SOFT_DROP_INTERVAL)),
+        ("up", "rotate", None),
+        ("x", "rotate", None),
+        ("z", "rotate_ccw", None),
+        ("a", "rotate_180", None),
+        ("space", "hard_drop", None),
+        ("shift", "hold", None),
+    )
+    KEY_ALIASES = {"left shift": "shift", "right shift": "shift"}
+
+    def __init__(self):
+        if keyboard is None:
+            raise RuntimeError("The keyboard module is required for live play (pip install keyboard).")
+        self._was_down = {key: False for key, _, _ in self.KEYS}
+        self._repeat_at = {}
+        # Key-down events seen by the hook thread, so a tap shorter than one wait is not lost.
+        self._pressed = set()
+        self._pressed_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._hook = keyboard.hook(self._on_event)
+
+    def _on_event(self, event):
+        if event.event_type == keyboard.KEY_DOWN and event.name:
+            name = event.name.lower()
+            with self._pressed_lock:
+                self._pressed.add(self.KEY_ALIASES.get(name, name))
+        self._wakeup.set()
+
+    def close(self):
+        keyboard.unhook(self._hook)
+
+    def next_deadline(self):
+        return min(self._repeat_at.values(), default=None)
+
+    def wait(self, timeout):
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def poll(self, game):
+        now = time.monotonic()
+        with self._pressed_lock:
+            pressed, self._pressed = self._pressed, set()
+
+        actions = []
+        for key, action, repeat in self.KEYS:
+            is_down = keyboard.is_pressed(key)
+            was_down = self._was_down[key]
+            self._was_down[key] = is_down
+            if not was_down and (is_down or key in pressed):
+                actions.append(action)
+                if is_down and repeat is not None:
+                    self._repeat_at[key] = now + repeat[0]
+            elif is_down and repeat is not None and now >= self._repeat_at.get(key, now):
+                actions.append(action)
+                self._repeat_at[key] = now + repeat[1]
+            if not is_down:
+                self._repeat_at.pop(key, None)
+        return actions
+
+
+class ScriptedInput:
+    # Each entry is one tick: an action, a list of actions, or None for an idle tick.
+    interactive = False
+
+    def __init__(self, script):
+        self._script = iter(script)
+        self.exhausted = False
+
+    def next_deadline(self):
+        return None
+
+    def wait(self, timeout):
+        time.sleep(FRAME_TIME if timeout is None else min(timeout, FRAME_TIME))
+
+    def poll(self, game):
+        try:
+            step = next(self._script)
+        except StopIteration:
+            self.exhausted = True
+            return []
+        return _as_actions(step)
+
+
+class PolicyInput:
+    # Wraps a callable policy(game) that returns an action, a list of actions or None.
+    interactive = False
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.exhausted = False
+
+    def next_deadline(self):
+        return None
+
+    def wait(self, timeout):
+        time.sleep(FRAME_TIME if timeout is None else min(timeout, FRAME_TIME))
+
+    def poll(self, game):
+        return _as_actions(self.policy(game))
+
+
+class RandomPolicy:
+    ACTIONS = ("left", "right", "rotate", "down", "hard_drop", "hold", None, None)
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def __call__(self, game):
+        return self.rng.choice(self.ACTIONS)
+
+
+def idle_policy(game):
+    return None
+
+
+# Heuristic weights for (aggregate height, completed lines, holes, bumpiness).
+AUTOPLAY_WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+# Seconds per decision before the search stops deepening; the current piece's own placement
+# search is not cut short, so boards much larger than standard can take longer.
+LOOKAHEAD_TIME_LIMIT = 0.08
+
+
+def _place_cells(rows, cells, full_mask=FULL_MASK):
+    rows = list(rows)
+    for cx, cy in cells:
+        rows[cy] |= 1 << cx
+    kept = [row for row in rows if row != full_mask]
+    lines = len(rows) - len(kept)
+    return [0] * lines + kept, lines
+
+
+def _board_features(rows, width=WIDTH):
+    height = len(rows)
+    heights = [0] * width
+    holes = 0
+    covered = 0
+    for y, row in enumerate(rows):
+        new = row & ~covered
+        if new:
+            for x in range(width):
+                if new >> x & 1:
+                    heights[x] = height - y
+        holes += bin(covered & ~row).count("1")
+        covered |= row
+    bumpiness = sum(abs(heights[x] - heights[x + 1]) for x in range(width - 1))
+    return sum(heights), holes, bumpiness
+
+
+def evaluate_boards(boards, lines, weights=AUTOPLAY_WEIGHTS, width=WIDTH):
+    # Scores every candidate board in one NumPy batch; falls back to plain Python without NumPy
+    # (or for boards too wide for int64 rows).
+    if not boards:
+        return []
+    w_height, w_lines, w_holes, w_bumps = weights
+    if np is None or width > 62:
+        scores = []
+        for rows, cleared in zip(boards, lines):
+            height, holes, bumpiness = _board_features(rows, width)
+            scores.append(w_height * height + w_lines * cleared + w_holes * holes + w_bumps * bumpiness)
+        return scores
+
+    bits = np.arange(width, dtype=np.int64)
+    filled = (np.asarray(boards, dtype=np.int64)[:, :, None] >> bits) & 1 != 0
+    any_filled = filled.any(axis=1)
+    heights = np.where(any_filled, len(boards[0]) - filled.argmax(axis=1), 0)
+    covered = np.logical_or.accumulate(filled, axis=1)
+    holes = (covered & ~filled).sum(axis=(1, 2))
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    scores = (
+        w_height * heights.sum(axis=1)
+        + w_lines * np.asarray(lines)
+        + w_holes * holes
+        + w_bumps * bumpiness
+    )
+    return scores.tolist()
+
+
+def best_placement(game, weights=AUTOPLAY_WEIGHTS):
+    placements = game.enumerate_placements()
+    placements += game.enumerate_placements(use_hold=True)
+    rows = game.board_rows()
+
+    candidates = []
+    boards = []
+    lines = []
+    for placement in placements:
+        rotation = game.pieces[placement.shape].rotations[placement.rotation]
+        cells = [(placement.x + bx, placement.y + by) for bx, by in rotation]
+        if any(cy < 0 for _, cy in cells):
+            continue
+        board, cleared = _place_cells(rows, cells, game.full_mask)
+        candidates.append(placement)
+        boards.append(board)
+        lines.append(cleared)
+
+    if not candidates:
+        return None
+    scores = evaluate_boards(boards, lines, weights, game.width)
+    best = max(range(len(candidates)), key=lambda i: (scores[i], -len(candidates[i].path)))
+    return candidates[best]
+
+
+class Autoplayer:
+    # Policy that plays the best heuristic placement. With moves_per_tick=None the whole path
+    # is returned at once (headless); otherwise it re-plans every tick from wherever gravity
+    # has moved the piece and feeds out only the first few inputs.
+    def __init__(self, seed=None, moves_per_tick=None, weights=AUTOPLAY_WEIGHTS):
+        self.moves_per_tick = moves_per_tick
+        self.weights = weights
+
+    def __call__(self, game):
+        if game.game_over:
+            return "restart"
+        placement = best_placement(game, self.weights)
+        path = placement.path if placement is not None else ["hard_drop"]
+        if self.moves_per_tick is None:
+            return path
+        return path[:self.moves_per_tick]
+
+
+def _build_zobrist_table(ruleset=None, seed=84):
+    # Tabulation hashing: one random 64-bit key per (row, byte of the row, byte value).
+    ruleset = DEFAULT_RULESET if ruleset is None else ruleset
+    rng = random.Random(seed)
+    chunks = (ruleset.width + 7) // 8
+    rows = tuple(
+        tuple(tuple(rng.getrandbits(64) for _ in range(256)) for _ in range(chunks)) for _ in range(ruleset.height)
+    )
+    pieces = {key: rng.getrandbits(64) for key in ruleset.shape_keys}
+    return rows, pieces
+
+
+ZOBRIST_ROWS, ZOBRIST_PIECES = _build_zobrist_table()
+
+
+def zobrist_hash(rows, table=ZOBRIST_ROWS):
+    h = 0
+    for keys, row in zip(table, rows):
+        if row:
+            for chunk_keys in keys:
+                h ^= chunk_keys[row & 0xFF]
+                row >>= 8
+    return h
+
+
+class TranspositionTable:
+    # Bounded dict with least-recently-used eviction.
+    def __init__(self, capacity=100_000):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+SearchNode = namedtuple("SearchNode", "rows board_hash piece held queue_index lines value first")
+
+
+class LookaheadSearch:
+    # Beam search over the known piece sequence (current, hold and next_queue). Placement lists
+    # and board evaluations are cached by Zobrist hash, so positions reached again on later
+    # turns or through a different hold order are not recomputed.
+    def __init__(self, depth=3, beam_width=8, time_limit=LOOKAHEAD_TIME_LIMIT, weights=AUTOPLAY_WEIGHTS,
+                 cache_size=100_000):
+        self.depth = depth
+        self.beam_width = beam_width
+        self.time_limit = time_limit
+        self.weights = weights
+        self.table = TranspositionTable(cache_size)
+        self.ruleset = None
+        self._scratch = None
+        # Running costs in seconds (ranking, per board; placement search, per uncached board and
+        # piece), so a layer stops early enough to finish and be ranked within the deadline.
+        self._rank_cost = 0.0
+        self._search_cost = 0.0
+
+    def _use_ruleset(self, ruleset):
+        # Hash keys, the scratch board and cached entries all belong to one ruleset.
+        if ruleset is self.ruleset:
+            return
+        self.ruleset = ruleset
+        if ruleset is DEFAULT_RULESET:
+            self._zobrist_rows, self._zobrist_pieces = ZOBRIST_ROWS, ZOBRIST_PIECES
+        else:
+            self._zobrist_rows, self._zobrist_pieces = _build_zobrist_table(ruleset)
+        self._scratch = BitboardTetris(DEFAULT_OPTIONS, persist=False, seed=0, ruleset=ruleset)
+        self.table = TranspositionTable(self.table.capacity)
+
+    def _placements(self, rows, board_hash, shape_key):
+        key = ("moves", board_hash ^ self._zobrist_pieces[shape_key])
+        cached = self.table.get(key)
+        if cached is None:
+            started = time.monotonic()
+            self._scratch._load_rows(rows)
+            x, y = self.ruleset.pieces[shape_key].spawn
+            cached = [
+                (placement.rotation, placement.x, placement.y)
+                for placement in self._scratch._placements_from(shape_key, 0, x, y, [], False)
+            ]
+            self.table.put(key, cached)
+            self._search_cost = self._search_cost * 0.9 + (time.monotonic() - started) * 0.1
+        return cached
+
+    def _board_scores(self, boards):
+        # Feature scores for (rows, hash) pairs without the line term; completed lines are added
+        # per path instead. Cache misses are scored together in one evaluate_boards batch.
+        scores = [self.table.get(("eval", board_hash)) for _, board_hash in boards]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            fresh = evaluate_boards([boards[i][0] for i in missing], [0] * len(missing), self.weights, self.ruleset.width)
+            for i, score in zip(missing, fresh):
+                scores[i] = score
+                self.table.put(("eval", boards[i][1]), score)
+        return scores
+
+    def _children(self, node, queue):
+        # Every node starts a fresh piece, so holding is always allowed once.
+        options = [(node.piece, node.held, node.queue_index)]
+        if node.held is not None:
+            options.append((node.held, node.piece, node.queue_index))
+        elif node.queue_index < len(queue):
+            options.append((queue[node.queue_index], node.piece, node.queue_index + 1))
+
+        for shape_key, held, queue_index in options:
+            if queue_index >= len(queue):
+                next_piece = None
+            else:
+                next_piece = queue[queue_index]
+                queue_index += 1
+            rotations = self.ruleset.pieces[shape_key].rotations
+            for rot, x, y in self._placements(node.rows, node.board_hash, shape_key):
+                cells = [(x + bx, y + by) for bx, by in rotations[rot]]
+                if any(cy < 0 for _, cy in cells):
+                    continue
+                rows, cleared = _place_cells(node.rows, cells, self.ruleset.full_mask)
+                yield rows, cleared, next_piece, held, queue_index
+
+    def choose(self, game):
+        deadline = time.monotonic() + self.time_limit if self.time_limit else None
+        self._use_ruleset(game.ruleset)
+        queue = list(game.next_queue[:PREVIEW_COUNT])
+        root_rows = game.board_rows()
+
+        # The first move comes from the live game so its path starts from the piece's real position.
+        # The current piece is always searched, and on large boards (the wide ruleset) that alone
+        # can outlast time_limit; the hold piece is skipped if its search would cross the deadline.
+        started = time.monotonic()
+        first_moves = game.enumerate_placements()
+        if deadline is None or not self._past(deadline, 2 * len(first_moves), time.monotonic() - started):
+            first_moves += game.enumerate_placements(use_hold=True)
+        candidates = []
+        for placement in first_moves:
+            rotation = game.pieces[placement.shape].rotations[placement.rotation]
+            cells = [(placement.x + bx, placement.y + by) for bx, by in rotation]
+            if any(cy < 0 for _, cy in cells):
+                continue
+            rows, cleared = _place_cells(root_rows, cells, game.full_mask)
+            if placement.hold:
+                held = game.shape_key
+                queue_index = 0 if game.held_piece is not None else 1
+            else:
+                held = game.held_piece
+                queue_index = 0
+            piece = queue[queue_index] if queue_index < len(queue) else None
+            board_hash = zobrist_hash(rows, self._zobrist_rows)
+            candidates.append(SearchNode(rows, board_hash, piece, held, queue_index + 1, cleared, None, placement))
+        beam = self._rank(candidates)
+        if not beam:
+            return None
+
+        # A layer cut short by the deadline is dropped; the last complete beam decides.
+        for _ in range(self.depth - 1):
+            children = []
+            for node in beam:
+                if node.piece is None:
+                    continue
+                if deadline is not None and self._past(deadline, len(children), 2 * self._search_cost):
+                    return beam[0].first
+                for rows, cleared, next_piece, held, queue_index in self._children(node, queue):
+                    if deadline is not None and self._past(deadline, len(children)):
+                        return beam[0].first
+                    board_hash = zobrist_hash(rows, self._zobrist_rows)
+                    children.append(SearchNode(
+                        rows, board_hash, next_piece, held, queue_index, node.lines + cleared, None, node.first
+                    ))
+            if not children:
+                break
+            beam = self._rank(children)
+
+        return beam[0].first
+
+    def _past(self, deadline, pending, extra=0.0):
+        return time.monotonic() + pending * self._rank_cost + extra >= deadline
+
+    def _rank(self, nodes):
+        # Scores one layer in a single batch and keeps the best beam_width nodes.
+        started = time.monotonic()
+        scores = self._board_scores([(node.rows, node.board_hash) for node in nodes])
+        w_lines = self.weights[1]
+        ranked = [node._replace(value=w_lines * node.lines + score) for node, score in zip(nodes, scores)]
+        ranked.sort(key=lambda node: node.value, reverse=True)
+        if nodes:
+            self._rank_cost = max(self._rank_cost * 0.9, (time.monotonic() - started) / len(nodes))
+        return ranked[:self.beam_width]
+
+
+class LookaheadPlayer:
+    # Like Autoplayer, but picks the first move of the best beam-search line.
+    def __init__(self, seed=None, moves_per_tick=None, **search_options):
+        self.moves_per_tick = moves_per_tick
+        self.search = LookaheadSearch(**search_options)
+
+    def __call__(self, game):
+        if game.game_over:
+            return "restart"
+        placement = self.search.choose(game)
+        path = placement.path if placement is not None else ["hard_drop"]
+        if self.moves_per_tick is None:
+            return path
+        return path[:self.moves_per_tick]
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "random": RandomPolicy,
+    "autoplay": Autoplayer,
+    "lookahead": LookaheadPlayer,
+}
+
+
+def _as_actions(step):
+    if step is None:
+        return []
+    if isinstance(step, str):
+        return [step]
+    return list(step)
+
+
+def apply_action(game, action):
+    if action == "left":
+        return game.move(-1, 0)
+    if action == "right":
+        return game.move(1, 0)
+    if action == "down":
+        return game.move(0, 1, soft_drop=True)
+    if action in ROTATE_ACTIONS:
+        return game.rotate(ROTATE_ACTIONS[action])
+    if action == "hard_drop":
+        game.hard_drop()
+        return True
+    if action == "hold":
+        return game.hold_piece()
+    if action == "gravity":
+        return game.move(0, 1)
+    return False
+
+
+GameResult = namedtuple("GameResult", "seed score lines level pieces ticks reason")
+
+
+def run_headless(options, input_source, engine="grid", max_ticks=None, max_pieces=None, seed=None, recorder=None):
+    # Steps the game on a virtual clock (one FRAME_TIME per tick) with no drawing or sleeping.
+    game = Tetris(options, engine=engine, persist=False, seed=seed)
+    if recorder is not None:
+        recorder.seed = game.seed
+    sim_time = 0.0
+    last_fall_time = 0.0
+    ticks = 0
+    reason = "game_over"
+
+    while not game.game_over:
+        if max_ticks is not None and ticks >= max_ticks:
+            reason = "max_ticks"
+            break
+        if max_pieces is not None and game.pieces_placed >= max_pieces:
+            reason = "max_pieces"
+            break
+
+        actions = input_source.poll(game)
+        if getattr(input_source, "exhausted", False):
+            reason = "input_exhausted"
+            break
+        if "quit" in actions:
+            reason = "quit"
+            break
+        tick_ms = round(sim_time * 1000)
+        for action in actions:
+            if game.game_over:
+                break
+            apply_action(game, action)
+            if recorder is not None:
+                recorder.record(tick_ms, action)
+
+        ticks += 1
+        sim_time += FRAME_TIME
+        if not game.game_over and sim_time - last_fall_time > game.fall_speed:
+            apply_action(game, "gravity")
+            if recorder is not None:
+                recorder.record(round(sim_time * 1000), "gravity")
+            last_fall_time = sim_time
+
+    return GameResult(game.seed, game.score, game.lines_cleared, game.level, game.pieces_placed, ticks, reason)
+
+
+REPLAY_MAGIC = b"T84R"
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct(">4sBQH")
+# Action codes are stored in replay files; only ever append to this tuple.
+REPLAY_ACTIONS = ("left", "right", "down", "rotate", "hard_drop", "hold", "gravity", "rotate_ccw", "rotate_180")
+REPLAY_ACTION_CODES = {action: code for code, action in enumerate(REPLAY_ACTIONS)}
+
+Replay = namedtuple("Replay", "seed options events")
+
+
+class ReplayRecorder:
+    # Collects (tick in ms, action) pairs for one game; gravity is logged as an action,
+    # so playback never depends on timing.
+    def __init__(self, seed, options):
+        self.seed = seed
+        self.options = dict(options)
+        self.events = []
+
+    def record(self, tick, action):
+        if action in REPLAY_ACTION_CODES:
+            self.events.append((int(tick), action))
+
+    def replay(self):
+        return Replay(self.seed, self.options, list(self.events))
+
+    def save(self, path):
+        Path(path).write_bytes(encode_replay(self.replay()))
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_replay(replay):
+    options = json.dumps(replay.options, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    out = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, replay.seed, len(options)))
+    out += options
+    last_tick = 0
+    for tick, action in replay.events:
+        _write_varint(out, tick - last_tick)
+        out.append(REPLAY_ACTION_CODES[action])
+        last_tick = tick
+    return bytes(out)
+
+
+def decode_replay(data):
+    if len(data) < REPLAY_HEADER.size:
+        raise ValueError("Not a Tetris84 replay")
+    magic, version, seed, options_len = REPLAY_HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or not 1 <= version <= REPLAY_VERSION:
+        raise ValueError("Not a Tetris84 replay")
+    pos = REPLAY_HEADER.size
+    if len(data) < pos + options_len:
+        raise ValueError("Truncated replay")
+    options = json.loads(data[pos:pos + options_len].decode("utf-8"))
+    if version == 1:
+        # Recorded before SRS: the standard pieces turned with the classic states and kicks.
+        options.setdefault("ruleset", "classic")
+    pos += options_len
+
+    events = []
+    tick = 0
+    while pos < len(data):
+        try:
+            delta, pos = _read_varint(data, pos)
+        except IndexError:
+            raise ValueError("Truncated replay") from None
+        if pos >= len(data):
+            raise ValueError("Truncated replay")
+        if data[pos] >= len(REPLAY_ACTIONS):
+            raise ValueError(f"Unknown replay action code {data[pos]}")
+        tick += delta
+        events.append((tick, REPLAY_ACTIONS[data[pos]]))
+        pos += 1
+    return Replay(seed, options, events)
+
+
+def load_replay(path):
+    return decode_replay(Path(path).read_bytes())
+
+
+def run_replay(replay, engine="grid"):
+    game = Tetris(replay.options, engine=engine, persist=False, seed=replay.seed)
+    last_tick = 0
+    for tick, action in replay.events:
+        if game.game_over:
+            break
+        apply_action(game, action)
+        last_tick = tick
+    reason = "game_over" if game.game_over else "replay_end"
+    # Event times are in ms; ticks are frames, as in run_headless.
+    ticks = round(last_tick / (FRAME_TIME * 1000))
+    return GameResult(game.seed, game.score, game.lines_cleared, game.level, game.pieces_placed, ticks, reason)
+
+
+def _make_policy(policy, seed):
+    # Policies are a POLICIES name, a plain callable, or a class instantiated per game with its seed.
+    if isinstance(policy, str):
+        policy = POLICIES[policy]
+    if isinstance(policy, type):
+        return policy(seed)
+    return policy
+
+
+def _run_batch_game(job):
+    seed, policy, options, engine, max_ticks, max_pieces = job
+    return run_headless(
+        options,
+        PolicyInput(_make_policy(policy, seed)),
+        engine=engine,
+        max_ticks=max_ticks,
+        max_pieces=max_pieces,
+        seed=seed,
+    )
+
+
+def run_batch(seeds, policy="random", options=None, engine="grid", workers=None, max_ticks=None, max_pieces=None):
+    # The policy must be picklable (a POLICIES name, module-level function or class) to cross processes.
+    options = dict(DEFAULT_OPTIONS if options is None else options)
+    jobs = [(seed, policy, options, engine, max_ticks, max_pieces) for seed in seeds]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        return [_run_batch_game(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_batch_game, jobs, chunksize=chunksize))
+
+
+class LatencyHistogram:
+    # Log-spaced buckets about 2% wide, so memory stays bounded however long a session runs.
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        micros = seconds * 1e6
+        index = int(math.log(micros, self.GROWTH)) if micros > 1 else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        # Upper edge of the bucket holding the requested sample, capped at the true maximum.
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        running = 0
+        for index in sorted(self.buckets):
+            running += self.buckets[index]
+            if running >= target:
+                return min(self.GROWTH ** (index + 1) / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 4),
+            "p50_ms": round(self.percentile(0.50) * 1000, 4),
+            "p95_ms": round(self.percentile(0.95) * 1000, 4),
+            "p99_ms": round(self.percentile(0.99) * 1000, 4),
+            "max_ms": round(self.max * 1000, 4),
+        }
+
+
+class Instrumentation:
+    # Opt-in timing for the live loop (--stats / --profile). Game methods are wrapped on the
+    # instance by attach(), so uninstrumented games run the plain code with no checks.
+    SECTIONS = ("frame", "input_poll", "draw", "gravity", "lock_piece", "clear_lines", "high_score_io")
+    STATS_FIELDS = ("section", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+    def __init__(self, stats_path=None, profile_path=None):
+        self.stats_path = stats_path
+        self.profile_path = profile_path
+        self.histograms = {name: LatencyHistogram() for name in self.SECTIONS}
+        self.profiler = None
+        if profile_path:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def record(self, section, seconds):
+        self.histograms[section].add(seconds)
+
+    @contextmanager
+    def timed(self, section):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, time.perf_counter() - started)
+
+    def _wrap(self, section, func):
+        histogram = self.histograms[section]
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.add(time.perf_counter() - started)
+
+        return wrapper
+
+    def attach(self, game):
+        game.draw = self._wrap("draw", game.draw)
+        game.lock_piece = self._wrap("lock_piece", game.lock_piece)
+        game.clear_lines = self._wrap("clear_lines", game.clear_lines)
+        game.save_high_score = self._wrap("high_score_io", game.save_high_score)
+        game.load_high_score = self._wrap("high_score_io", game.load_high_score)
+        return game
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def dump(self, path):
+        summary = self.summary()
+        path = Path(path)
+        if path.suffix.lower() == ".csv":
+            with path.open("w", newline="", encoding="utf-8") as handle:
+                writer = csv.DictWriter(handle, fieldnames=self.STATS_FIELDS)
+                writer.writeheader()
+                for name, row in summary.items():
+                    writer.writerow({"section": name, **row})
+        else:
+            path.write_text(json.dumps({"sections": summary}, indent=2), encoding="utf-8")
+
+    def close(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+            self.profiler = None
+        if self.stats_path:
+            self.dump(self.stats_path)
+
+
+def _spectator_socket(address, listen=True):
+    # "unix:/path/to.sock" or "host:port" (":port" means localhost).
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if listen:
+            # A socket file left behind by an earlier session would block bind().
+            if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+            sock.bind(path)
+            sock.listen()
+        else:
+            sock.connect(path)
+        return sock
+    host, _, port = address.rpartition(":")
+    if listen:
+        return socket.create_server((host or "127.0.0.1", int(port)))
+    return socket.create_connection((host or "127.0.0.1", int(port)))
+
+
+class SpectatorViewer:
+    # One connected viewer. Its thread sends only the newest frame, so a slow viewer skips frames
+    # instead of queueing them or holding up the game loop.
+    def __init__(self, conn, on_close):
+        self.conn = conn
+        self.on_close = on_close
+        self.sent = 0
+        self.dropped = 0
+        self._pending = None
+        self._closed = False
+        self._ready = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def offer(self, frame):
+        with self._ready:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self._ready.notify()
+
+    def close(self):
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _run(self):
+        try:
+            while True:
+                with self._ready:
+                    while self._pending is None and not self._closed:
+                        self._ready.wait()
+                    if self._closed:
+                        return
+                    frame, self._pending = self._pending, None
+                self.conn.sendall(frame)
+                self.sent += 1
+        except OSError:
+            pass
+        finally:
+            self.conn.close()
+            self.on_close(self)
+
+
+class SpectatorFeed:
+    # Mirrors the live game's frames to any number of viewers (--spectate). Each frame is encoded
+    # once as a full-screen redraw and the same bytes object is handed to every viewer.
+    def __init__(self, address):
+        self.address = address
+        self.server = _spectator_socket(address)
+        self.viewers = set()
+        self._frame = None
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def publish(self, lines):
+        frame = ("\033[H" + "".join(line + "\033[K\r\n" for line in lines) + "\033[J").encode("utf-8")
+        with self._lock:
+            self._frame = frame
+            viewers = list(self.viewers)
+        for viewer in viewers:
+            viewer.offer(frame)
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            viewer = SpectatorViewer(conn, self._remove)
+            # Offered under the lock, so a frame published meanwhile always lands after this one.
+            with self._lock:
+                self.viewers.add(viewer)
+                if self._frame is not None:
+                    viewer.offer(b"\033[2J" + self._frame)
+            viewer.start()
+
+    def _remove(self, viewer):
+        with self._lock:
+            self.viewers.discard(viewer)
+
+    def close(self):
+        self.server.close()
+        with self._lock:
+            viewers = list(self.viewers)
+        for viewer in viewers:
+            viewer.close()
+        if self.address.startswith("unix:"):
+            try:
+                os.unlink(self.address[len("unix:"):])
+            except OSError:
+                pass
+
+
+def watch_spectator(address):
+    # A plain terminal viewer for --spectate; `nc` works as well.
+    sock = _spectator_socket(address, listen=False)
+    clear_screen()
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+
+
+def run_game(options, input_source=None, record_path=None, stats=None, spectators=None):
+    # With record_path, the most recent game is saved there as a replay; stats is an
+    # optional Instrumentation that collects frame timings and spectators a SpectatorFeed.
+    if input_source is None:
+        input_source = KeyboardInput()
+    try:
+        _run_game_loop(options, input_source, record_path, stats, spectators)
+    finally:
+        if hasattr(input_source, "close"):
+            input_source.close()
+
+
+def _run_game_loop(options, input_source, record_path=None, stats=None, spectators=None):
+    # Sleeps until the next gravity or key-repeat deadline (or an input event) and
+    # redraws only after something changed.
+    # Only a player at the keyboard sets records; autoplay and scripted games leave highscore.json alone.
+    game = Tetris(options, persist=input_source.interactive)
+    if stats is not None:
+        stats.attach(game)
+    recorder = ReplayRecorder(game.seed, options) if record_path else None
+    game_started = time.monotonic()
+    next_fall_time = game_started + game.fall_speed
     clear_screen()
 
     paused = False
     score_submitted = False
     show_controls = False
-    last_fall_time = time.time()
-    one_shot_keys = {"up": False, "space": False, "shift": False, "p": False, "r": False, "q": False, "h": False}
-
-    def just_pressed(key):
-        is_down = keyboard.is_pressed(key)
-        was_down = one_shot_keys[key]
-        one_shot_keys[key] = is_down
-        return is_down and not was_down
+    dirty = True
+    frame_started = None
 
     while True:
-        status_message = tr(options, "game_over") if game.game_over else None
-        game.draw(paused=paused, show_controls=show_controls, status_message=status_message)
+        if dirty:
+            status_message = tr(options, "game_over") if game.game_over else None
+            game.draw(paused=paused, show_controls=show_controls, status_message=status_message)
+            if spectators is not None:
+                spectators.publish(game.renderer.previous)
+            dirty = False
+        if frame_started is not None:
+            # From waking up to the end of the redraw; time spent waiting is not counted.
+            stats.record("frame", time.perf_counter() - frame_started)
+            frame_started = None
+
+        if game.game_over and not score_submitted:
+            if recorder is not None:
+                recorder.save(record_path)
+            details = {
+                "seed": game.seed,
+                "difficulty": options.get("difficulty", "normal"),
+                "lines": game.lines_cleared,
+                "level": game.level,
+                "duration": time.monotonic() - game_started,
+            }
+            if not input_source.interactive:
+                # Nobody at the keyboard to type initials (autoplay or scripted input).
+                record_game("CPU", game.score, **details)
+                score_submitted = True
+                continue
+            game_id = record_game("", game.score, **details)
+            prompt_for_leaderboard_initials(options, game.score, game_id=game_id, **details)
+            game.high_score = game.load_high_score()
+            game.renderer.invalidate()
+            input_source.poll(game)  # drop keys typed into the initials prompt
+            score_submitted = True
+            dirty = True
+            continue
+
+        deadline = input_source.next_deadline()
+        if not paused and not game.game_over:
+            deadline = next_fall_time if deadline is None else min(deadline, next_fall_time)
+        input_source.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
 
-        if just_pressed("q"):
+        if stats is not None:
+            frame_started = time.perf_counter()
+            actions = input_source.poll(game)
+            stats.record("input_poll", time.perf_counter() - frame_started)
+        else:
+            actions = input_source.poll(game)
+        now = time.monotonic()
+        if actions:
+            dirty = True
+
+        if "quit" in actions:
             game.update_high_score()
+            game.save_high_score()
+            if recorder is not None and not game.game_over:
+                recorder.save(record_path)
             return
 
-        if just_pressed("r"):
-            game = Tetris(options)
+        if "restart" in actions:
+            game.save_high_score()
+            if recorder is not None and not game.game_over:
+                recorder.save(record_path)
+            game = Tetris(options, persist=input_source.interactive)
+            if stats is not None:
+                stats.attach(game)
+            if recorder is not None:
+                recorder = ReplayRecorder(game.seed, options)
+            game_started = now
+            next_fall_time = now + game.fall_speed
             paused = False
             score_submitted = False
-            last_fall_time = time.time()
             clear_screen()
             continue
 
-        if just_pressed("p"):
+        if "pause" in actions:
             paused = not paused
+            if not paused:
+                next_fall_time = now + game.fall_speed
 
-        if just_pressed("h"):
+        if "toggle_controls" in actions:
             show_controls = not show_controls
 
         if game.game_over:
-            if not score_submitted:
-                prompt_for_leaderboard_initials(options, game.score)
-                game.high_score = game.load_high_score()
-                score_submitted = True
-            time.sleep(0.05)
             continue
 
         if not paused:
-            if keyboard.is_pressed("left"):
-                game.move(-1, 0)
-            if keyboard.is_pressed("right"):
-                game.move(1, 0)
-            if keyboard.is_pressed("down"):
-                game.move(0, 1, soft_drop=True)
-            if just_pressed("up"):
-                game.rotate()
-            if just_pressed("space"):
-                game.hard_drop()
-            if just_pressed("shift"):
-                game.hold_piece()
-
-            if time.time() - last_fall_time > game.fall_speed:
-                game.move(0, 1)
-                last_fall_time = time.time()
-
-        time.sleep(0.05)
-
-
-def main():
+            tick_ms = round((now - game_started) * 1000)
+            for action in actions:
+                apply_action(game, action)
+                if recorder is not None:
+                    recorder.record(tick_ms, action)
+
+            if now >= next_fall_time:
+                if stats is not None:
+                    with stats.timed("gravity"):
+                        apply_action(game, "gravity")
+                else:
+                    apply_action(game, "gravity")
+                if recorder is not None:
+                    recorder.record(tick_ms, "gravity")
+                dirty = True
+                # Deadlines advance from the previous one so gravity does not drift,
+                # but a long stall does not turn into a burst of catch-up drops.
+                next_fall_time += game.fall_speed
+                if next_fall_time <= now:
+                    next_fall_time = now + game.fall_speed
+
+
+def run_headless_cli(args):
     options = dict(DEFAULT_OPTIONS)
+    options["difficulty"] = args.difficulty
+    if args.ruleset != "standard":
+        options["ruleset"] = args.ruleset
+    seeds = range(args.seed, args.seed + args.games)
+    started = time.perf_counter()
+    results = run_batch(
+        seeds,
+        policy=args.policy,
+        options=options,
+        engine=args.engine,
+        workers=args.workers,
+        max_ticks=args.max_ticks,
+        max_pieces=args.max_pieces,
+    )
+    elapsed = time.perf_counter() - started
+
+    if args.scores_db:
+        score_store.add_entries(
+            ("CPU", r.score, r.seed, args.difficulty, r.lines, r.level, r.ticks * FRAME_TIME) for r in results
+        )
 
-    while True:
-        action = show_main_menu(options)
-        if action == "play":
-            run_game(options)
-        elif action == "options":
-            show_options_menu(options)
-        elif action == "leaderboard":
-            show_leaderboard(options)
-        else:
-            clear_screen()
-            print(tr(options, "bye"))
-            return
+    if not args.quiet:
+        for result in results:
+            print(
+                f"seed {result.seed}: score={result.score} lines={result.lines} level={result.level} "
+                f"pieces={result.pieces} ticks={result.ticks} reason={result.reason}"
+            )
+    rate = len(results) / elapsed if elapsed > 0 else float("inf")
+    mean_score = sum(r.score for r in results) / len(results) if results else 0.0
+    print(f"{len(results)} games in {elapsed:.3f}s ({rate:.1f} games/s), mean score {mean_score:.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris84")
+    parser.add_argument("--headless", action="store_true", help="simulate games without a terminal or keyboard")
+    parser.add_argument("--games", type=int, default=1, help="number of headless games to run")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first headless game")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random", help="headless input policy")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="grid", help="board engine")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_SPEEDS), default="normal")
+    parser.add_argument("--ruleset", choices=sorted(RULESETS), default="standard", help="board size, pieces and scoring")
+    parser.add_argument("--max-ticks", type=int, default=None, help="stop each headless game after this many ticks")
+    parser.add_argument("--max-pieces", type=int, default=None, help="stop each headless game after this many pieces")
+    parser.add_argument(
+        "--autoplay",
+        nargs="?",
+        const="autoplay",
+        choices=("autoplay", "lookahead"),
+        help="let the built-in AI play the live game (greedy 'autoplay' or 'lookahead' search)",
+    )
+    parser.add_argument("--record", default=None, metavar="PATH", help="save the most recent game as a replay file")
+    parser.add_argument(
+        "--replay",
+        nargs="+",
+        default=None,
+        metavar="PATH",
+        help="re-run replay files headless and print results",
+    )
+    parser.add_argument("--scores-db", default=None, help="keep scores in this SQLite database instead of highscore.json")
+    parser.add_argument("--quiet", action="store_true", help="only print the headless summary")
+    parser.add_argument(
+        "--stats",
+        default=None,
+        metavar="PATH",
+        help="write frame timing percentiles on exit (JSON, or CSV if PATH ends in .csv)",
+    )
+    parser.add_argument("--profile", default=None, metavar="PATH", help="write cProfile stats for the session on exit")
+    parser.add_argument(
+        "--spectate",
+        default=None,
+        metavar="ADDRESS",
+        help="mirror the live game to viewers on host:port or unix:/path",
+    )
+    parser.add_argument("--watch", default=None, metavar="ADDRESS", help="watch a game started with --spectate")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.scores_db:
+        set_score_store(SqliteScoreStore(args.scores_db))
+    if args.replay:
+        for path in args.replay:
+            result = run_replay(load_replay(path), engine=args.engine)
+            print(
+                f"{path}: seed={result.seed} score={result.score} lines={result.lines} level={result.level} "
+                f"pieces={result.pieces} reason={result.reason}"
+            )
+        return
+    if args.headless:
+        run_headless_cli(args)
+        return
+    if args.watch:
+        watch_spectator(args.watch)
+        return
+
+    options = dict(DEFAULT_OPTIONS)
+    if args.ruleset != "standard":
+        options["ruleset"] = args.ruleset
+    stats = None
+    if args.stats or args.profile:
+        stats = Instrumentation(stats_path=args.stats, profile_path=args.profile)
+    spectators = SpectatorFeed(args.spectate) if args.spectate else None
+
+    try:
+        while True:
+            action = show_main_menu(options)
+            if action == "play" and args.autoplay:
+                try:
+                    player = POLICIES[args.autoplay](moves_per_tick=1)
+                    run_game(options, PolicyInput(player), record_path=args.record, stats=stats, spectators=spectators)
+                except KeyboardInterrupt:
+                    pass
+            elif action == "play":
+                run_game(options, record_path=args.record, stats=stats, spectators=spectators)
+            elif action == "options":
+                show_options_menu(options)
+            elif action == "leaderboard":
+                show_leaderboard(options)
+            else:
+                clear_screen()
+                print(tr(options, "bye"))
+                return
+    finally:
+        if stats is not None:
+            stats.close()
+        if spectators is not None:
+            spectators.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,346 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+import game
+
+# Line-delimited JSON over TCP.
+#   client -> server: {"op": "join"}, then {"op": "action", "action": "left"} ...
+#   server -> client: {"type": "waiting"}, {"type": "start", ...}, {"type": "state", ...}, {"type": "over", ...}
+CLIENT_ACTIONS = frozenset(("left", "right", "down", "hard_drop", "hold", *game.ROTATE_ACTIONS))
+INBOX_LIMIT = 32  # queued actions per player between ticks; extra input is dropped
+WRITE_BUFFER_LIMIT = 64 * 1024  # bytes queued for a viewer before its state updates are skipped
+GARBAGE_FOR_LINES = {0: 0, 1: 0, 2: 1, 3: 2, 4: 4}
+STATE_FIELDS = (
+    "shape_key", "rotation", "x", "y", "held_piece", "hold_used", "next_queue",
+    "score", "level", "lines_cleared", "pieces_placed", "combo", "back_to_back", "game_over",
+)
+
+
+def attack_for(lines, t_spin):
+    # Mini T-spins attack like plain clears.
+    return lines * 2 if t_spin == game.T_SPIN_FULL else GARBAGE_FOR_LINES.get(lines, lines)
+
+
+def state_delta(previous, current):
+    # Rows are bitmasks (bit x = column x); only rows and fields that changed since `previous` are sent.
+    if previous is None:
+        delta = {"rows": list(current.rows)}
+        delta.update((field, getattr(current, field)) for field in STATE_FIELDS)
+        return delta
+    delta = {}
+    rows = {str(y): row for y, (old, row) in enumerate(zip(previous.rows, current.rows)) if old != row}
+    if rows:
+        delta["rows"] = rows
+    for field in STATE_FIELDS:
+        value = getattr(current, field)
+        if value != getattr(previous, field):
+            delta[field] = value
+    return delta
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class Player:
+    def __init__(self, writer, index):
+        self.writer = writer
+        self.index = index
+        self.game = None
+        self.inbox = deque()
+        self.pending_garbage = 0
+        self.last_fall = 0.0
+        self.state = None
+        # What this viewer last received for each player in the match (None = nothing yet).
+        self.seen = {}
+
+
+class Match:
+    def __init__(self, match_id, seed):
+        self.match_id = match_id
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.players = []
+        self.running = False
+        self.finished = False
+
+
+class Hub:
+    # Every match shares one ticker; each tick applies the queued input, gravity and garbage,
+    # then sends each changed player state once per match, encoded once for all in-sync viewers.
+    def __init__(self, options=None, engine="bitboard", tick=game.FRAME_TIME, seed=None):
+        self.options = dict(options or game.DEFAULT_OPTIONS)
+        self.engine = engine
+        self.tick = tick
+        self.rng = random.Random(seed)
+        self.matches = {}
+        self.waiting = None
+        self.next_match_id = 0
+        self.ticks = 0
+        self.step_time = 0.0
+        self.max_step_time = 0.0
+        self.finished_matches = 0
+
+    def join(self, writer):
+        match = self.waiting
+        if match is None:
+            match = Match(self.next_match_id, self.rng.randrange(2 ** 32))
+            self.next_match_id += 1
+            self.matches[match.match_id] = match
+            self.waiting = match
+        player = Player(writer, len(match.players))
+        match.players.append(player)
+        if len(match.players) == 2:
+            self.waiting = None
+            self._start(match)
+        else:
+            self._send(player, encode({"type": "waiting", "match": match.match_id}))
+        return match, player
+
+    def leave(self, match, player):
+        if match is self.waiting:
+            self.waiting = None
+            self.matches.pop(match.match_id, None)
+        elif match.running and not match.finished:
+            self._finish(match, winner=1 - player.index)
+
+    def _start(self, match):
+        now = time.monotonic()
+        for player in match.players:
+            # Same seed, so both players draw the same 7-bag sequence.
+            player.game = game.Tetris(self.options, engine=self.engine, persist=False, seed=match.seed)
+            player.last_fall = now
+        match.running = True
+        for player in match.players:
+            self._send(player, encode({"type": "start", "match": match.match_id, "player": player.index, "seed": match.seed}))
+
+    def _apply(self, match, player, action):
+        tetris = player.game
+        placed = tetris.pieces_placed
+        game.apply_action(tetris, action)
+        if tetris.pieces_placed != placed and not tetris.game_over:
+            self._after_lock(match, player)
+
+    def _after_lock(self, match, player):
+        # Lines sent first cancel the sender's own incoming garbage; a lock without an attack
+        # lets the pending garbage rise.
+        attack = attack_for(*player.game.last_clear)
+        if attack:
+            cancelled = min(attack, player.pending_garbage)
+            player.pending_garbage -= cancelled
+            attack -= cancelled
+            if attack:
+                match.players[1 - player.index].pending_garbage += attack
+        elif player.pending_garbage:
+            player.game.add_garbage(player.pending_garbage, match.rng.randrange(player.game.width))
+            player.pending_garbage = 0
+
+    def step(self, now=None):
+        started = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        for match in list(self.matches.values()):
+            if not match.running or match.finished:
+                continue
+            for player in match.players:
+                tetris = player.game
+                while player.inbox and not tetris.game_over:
+                    self._apply(match, player, player.inbox.popleft())
+                if not tetris.game_over and now - player.last_fall >= tetris.fall_speed:
+                    self._apply(match, player, "gravity")
+                    player.last_fall = now
+            self._broadcast(match)
+            losers = [player.index for player in match.players if player.game.game_over]
+            if losers:
+                self._finish(match, winner=None if len(losers) == 2 else 1 - losers[0])
+        elapsed = time.perf_counter() - started
+        self.ticks += 1
+        self.step_time += elapsed
+        self.max_step_time = max(self.max_step_time, elapsed)
+
+    def _broadcast(self, match):
+        for player in match.players:
+            previous = player.state
+            current = player.game.snapshot()
+            if current == previous:
+                continue
+            player.state = current
+            shared = None
+            for viewer in match.players:
+                if self._backed_up(viewer):
+                    continue
+                seen = viewer.seen.get(player.index)
+                if seen is previous:
+                    if shared is None:
+                        shared = encode({"type": "state", "player": player.index, "delta": state_delta(previous, current)})
+                    payload = shared
+                else:
+                    payload = encode({"type": "state", "player": player.index, "delta": state_delta(seen, current)})
+                viewer.seen[player.index] = current
+                self._send(viewer, payload)
+
+    def _backed_up(self, viewer):
+        transport = viewer.writer.transport
+        return transport is not None and transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT
+
+    def _finish(self, match, winner):
+        match.finished = True
+        self.finished_matches += 1
+        message = encode({"type": "over", "match": match.match_id, "winner": winner})
+        for player in match.players:
+            self._send(player, message)
+        self.matches.pop(match.match_id, None)
+
+    def _send(self, player, payload):
+        writer = player.writer
+        if not writer.is_closing():
+            writer.write(payload)
+
+    async def handle_client(self, reader, writer):
+        match = player = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                op = message.get("op")
+                if op == "join" and player is None:
+                    match, player = self.join(writer)
+                elif op == "action" and player is not None and match.running:
+                    action = message.get("action")
+                    if action in CLIENT_ACTIONS and len(player.inbox) < INBOX_LIMIT:
+                        player.inbox.append(action)
+                if match is not None and match.finished:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if player is not None:
+                self.leave(match, player)
+            writer.close()
+
+    async def run(self):
+        # Deadlines advance by whole ticks so the match clock does not drift with step time.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            self.step()
+            deadline += self.tick
+            delay = deadline - loop.time()
+            if delay < 0:
+                deadline = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+
+async def serve(host="127.0.0.1", port=8484, engine="bitboard", options=None):
+    hub = Hub(options=options, engine=engine)
+    server = await asyncio.start_server(hub.handle_client, host, port)
+    ticker = asyncio.create_task(hub.run())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        ticker.cancel()
+
+
+async def loopback_client(host, port, seed, actions_per_second=10.0):
+    # Test client: joins, presses random keys at a steady rate and counts what comes back.
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"op": "join"}))
+    stats = {"messages": 0, "bytes": 0, "result": None}
+    started = asyncio.Event()
+
+    async def press_keys():
+        await started.wait()
+        actions = sorted(CLIENT_ACTIONS - {"hold"})
+        while not writer.is_closing():
+            writer.write(encode({"op": "action", "action": rng.choice(actions)}))
+            await writer.drain()
+            await asyncio.sleep(1 / actions_per_second)
+
+    presser = asyncio.create_task(press_keys())
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            stats["messages"] += 1
+            stats["bytes"] += len(line)
+            message = json.loads(line)
+            if message["type"] == "start":
+                started.set()
+            elif message["type"] == "over":
+                stats["result"] = message
+                break
+    finally:
+        presser.cancel()
+        writer.close()
+    return stats
+
+
+async def run_loopback(matches=100, actions_per_second=10.0, engine="bitboard", timeout=60.0):
+    hub = Hub(engine=engine, seed=0)
+    server = await asyncio.start_server(hub.handle_client, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    ticker = asyncio.create_task(hub.run())
+    started = time.perf_counter()
+    try:
+        clients = [loopback_client("127.0.0.1", port, seed, actions_per_second) for seed in range(matches * 2)]
+        results = await asyncio.wait_for(asyncio.gather(*clients), timeout)
+    finally:
+        ticker.cancel()
+        server.close()
+        await server.wait_closed()
+    return hub, results, time.perf_counter() - started
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris84 versus server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8484)
+    parser.add_argument("--engine", choices=sorted(game.ENGINES), default="bitboard", help="board engine")
+    parser.add_argument(
+        "--loopback",
+        type=int,
+        default=None,
+        metavar="MATCHES",
+        help="run this many local test matches and exit",
+    )
+    parser.add_argument("--rate", type=float, default=10.0, help="actions per second sent by each loopback client")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.loopback is None:
+        print(f"Listening on {args.host}:{args.port}")
+        try:
+            asyncio.run(serve(args.host, args.port, engine=args.engine))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    hub, results, elapsed = asyncio.run(run_loopback(args.loopback, args.rate, engine=args.engine))
+    finished = sum(1 for stats in results if stats["result"] is not None)
+    total_bytes = sum(stats["bytes"] for stats in results)
+    mean_step = hub.step_time / hub.ticks * 1000 if hub.ticks else 0.0
+    print(
+        f"{args.loopback} matches, {finished} clients saw a result in {elapsed:.1f}s; "
+        f"{sum(stats['messages'] for stats in results)} messages, {total_bytes / 1024:.0f} KiB; "
+        f"tick {mean_step:.2f} ms mean, {hub.max_step_time * 1000:.2f} ms max over {hub.ticks} ticks"
+    )
+
+
+if __name__ == "__main__":
+    main()
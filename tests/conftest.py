@@ -0,0 +1,37 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import game  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def score_store(tmp_path):
+    # Keep test games away from the real highscore.json.
+    store = game.JsonScoreStore(tmp_path / "highscore.json")
+    previous = game.score_store
+    game.set_score_store(store)
+    yield store
+    game.set_score_store(previous)
+
+
+def _play_random(engine, seed, ruleset="standard", steps=600):
+    # Applies seeded random actions (every replay action) and returns the game and its snapshots.
+    tetris = game.Tetris({"ruleset": ruleset}, engine=engine, persist=False, seed=seed)
+    rng = random.Random(seed)
+    snapshots = [tetris.snapshot()]
+    for _ in range(steps):
+        if tetris.game_over:
+            break
+        game.apply_action(tetris, rng.choice(game.REPLAY_ACTIONS))
+        snapshots.append(tetris.snapshot())
+    return tetris, snapshots
+
+
+@pytest.fixture
+def play_random():
+    return _play_random
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.mark.parametrize("ruleset", ["standard", "classic", "pentomino"])
+@pytest.mark.parametrize("seed", range(4))
+def test_engines_agree(play_random, ruleset, seed):
+    _, grid = play_random("grid", seed, ruleset)
+    _, bitboard = play_random("bitboard", seed, ruleset)
+    assert grid == bitboard
@@ -0,0 +1,18 @@
+import pytest
+
+import game
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_clear_lines_invalidates_the_ghost(engine):
+    tetris = game.Tetris({}, engine=engine, persist=False, seed=3)
+    state = tetris.snapshot()
+    full = (1 << tetris.width) - 1
+    # A block sits on two full rows, so the ghost drops two rows once they clear.
+    tetris.restore(state._replace(rows=state.rows[:-3] + (1, full, full)))
+    before = tetris.get_ghost_y()
+
+    assert tetris.clear_lines() == 2
+    fresh = game.Tetris({}, engine=engine, persist=False, seed=3)
+    fresh.restore(tetris.snapshot())
+    assert tetris.get_ghost_y() == fresh.get_ghost_y() == before + 2
@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+import game
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_clone_of_instrumented_game(play_random, engine):
+    tetris, _ = play_random(engine, 5, steps=100)
+    stats = game.Instrumentation()
+    stats.attach(tetris)
+    before = tetris.snapshot()
+
+    clone = tetris.clone()
+    rng = random.Random(5)
+    for _ in range(200):
+        game.apply_action(clone, rng.choice(game.REPLAY_ACTIONS))
+        game.apply_action(clone, "hard_drop")
+    assert clone.pieces_placed > before.pieces_placed
+    assert tetris.snapshot() == before
+    assert stats.histograms["lock_piece"].count == 0
+
+    game.apply_action(tetris, "hard_drop")
+    assert stats.histograms["lock_piece"].count == 1
@@ -0,0 +1,8 @@
+import game
+
+
+def test_scripted_game_leaves_high_score_alone(score_store):
+    script = ["hard_drop"] * 40 + [None] * 5 + ["quit"]
+    game.run_game(dict(game.DEFAULT_OPTIONS), game.ScriptedInput(script))
+    assert score_store.load()["high_score"] == 0
+    assert not score_store.path.exists()
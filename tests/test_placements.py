@@ -0,0 +1,66 @@
+import copy
+import random
+
+import pytest
+
+import game
+
+
+def reach(tetris, placement):
+    # Follows the placement's path on a copy and returns the cells and spin kind it locks with.
+    copied = copy.deepcopy(tetris)
+    locked = {}
+    lock_piece = copied.lock_piece
+
+    def capture():
+        if not locked:
+            coords = copied.pieces[copied.shape_key].rotations[copied.rotation]
+            locked["cells"] = sorted((copied.x + bx, copied.y + by) for bx, by in coords)
+            locked["t_spin"] = copied.is_t_spin()
+        lock_piece()
+
+    copied.lock_piece = capture
+    for action in placement.path:
+        game.apply_action(copied, action)
+    return locked
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+@pytest.mark.parametrize("seed", range(6))
+def test_placement_paths_reach_their_placement(engine, seed):
+    tetris = game.Tetris({}, engine=engine, persist=False, seed=seed)
+    rng = random.Random(seed)
+    for _ in range(rng.randrange(4, 10)):
+        for _ in range(rng.randrange(3)):
+            tetris.rotate(rng.choice((1, -1, 2)))
+        for _ in range(rng.randrange(5)):
+            tetris.move(rng.choice((-1, 1)), 0)
+        tetris.hard_drop()
+    assert not tetris.game_over
+
+    for use_hold in (False, True):
+        placements = tetris.enumerate_placements(use_hold)
+        assert placements
+        for placement in placements:
+            coords = tetris.pieces[placement.shape].rotations[placement.rotation]
+            expected = sorted((placement.x + bx, placement.y + by) for bx, by in coords)
+            assert reach(tetris, placement) == {"cells": expected, "t_spin": placement.t_spin}
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_placements_cover_every_hard_drop(engine):
+    # Every column and rotation reachable by turning at spawn and sliding is found.
+    tetris = game.Tetris({}, engine=engine, persist=False, seed=2)
+    found = {tuple(sorted((p.x + bx, p.y + by) for bx, by in tetris.pieces[p.shape].rotations[p.rotation]))
+             for p in tetris.enumerate_placements()}
+    shape_key = tetris.shape_key
+    for rot in range(len(tetris.pieces[shape_key].rotations)):
+        for x in range(-3, tetris.width + 3):
+            probe = copy.deepcopy(tetris)
+            probe.rotation = rot
+            probe.x = x
+            if probe.check_collision(0, 0, rot):
+                continue
+            probe.y = probe.get_ghost_y()
+            cells = tuple(sorted((probe.x + bx, probe.y + by) for bx, by in probe.get_current_coords()))
+            assert cells in found
@@ -0,0 +1,110 @@
+import io
+import random
+import re
+import unicodedata
+
+import pytest
+
+import game
+
+ESCAPE = re.compile(r"\033\[(?:(\d+);(\d+)H|K|2J|H)")
+
+
+def cell_width(ch):
+    return 2 if unicodedata.east_asian_width(ch) in "WF" else 1
+
+
+class Terminal:
+    # Just enough of a terminal for DiffRenderer: cursor moves, erase to end of line,
+    # clear screen, and characters that take one or two columns.
+    def __init__(self):
+        self.rows = {}
+        self.row = self.col = 0
+
+    def feed(self, data):
+        pos = 0
+        for match in ESCAPE.finditer(data):
+            self.write(data[pos:match.start()])
+            pos = match.end()
+            code = match.group(0)
+            if match.group(1):
+                self.row, self.col = int(match.group(1)) - 1, int(match.group(2)) - 1
+            elif code.endswith("K"):
+                del self.line()[self.col:]
+            elif code.endswith("2J"):
+                self.rows = {}
+            else:
+                self.row = self.col = 0
+        self.write(data[pos:])
+
+    def line(self):
+        return self.rows.setdefault(self.row, [])
+
+    def put(self, col, cell):
+        line = self.line()
+        line.extend(" " for _ in range(col + 1 - len(line)))
+        # Overwriting either half of a wide character blanks the other half.
+        if line[col] is None:
+            line[col - 1] = " "
+        elif col + 1 < len(line) and line[col + 1] is None:
+            line[col + 1] = " "
+        line[col] = cell
+
+    def write(self, text):
+        for ch in text:
+            self.put(self.col, ch)
+            if cell_width(ch) == 2:
+                self.put(self.col + 1, None)
+            self.col += cell_width(ch)
+
+    def screen(self, rows):
+        return ["".join(cell for cell in self.rows.get(row, []) if cell is not None).rstrip() for row in range(rows)]
+
+
+def frames(seed):
+    tetris = game.Tetris(dict(game.DEFAULT_OPTIONS), persist=False, seed=seed)
+    rng = random.Random(seed)
+    for step in range(400):
+        game.apply_action(tetris, rng.choice(game.REPLAY_ACTIONS))
+        if step % 25 == 0:
+            tetris.options["language"] = rng.choice(game.LANGUAGE_ORDER)
+        yield tetris.render_lines(
+            paused=step % 40 < 5,
+            show_controls=step % 30 < 10,
+            status_message="GAME OVER" if tetris.game_over else None,
+        )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_diff_renderer_reproduces_every_frame(seed):
+    stream = io.StringIO()
+    renderer = game.DiffRenderer(stream)
+    terminal = Terminal()
+    for lines in frames(seed):
+        renderer.render(lines)
+        terminal.feed(stream.getvalue())
+        stream.seek(0)
+        stream.truncate()
+        height = max(len(lines), max(terminal.rows, default=0) + 1)
+        assert terminal.screen(height) == [line.rstrip() for line in lines] + [""] * (height - len(lines))
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("score 100", "score 2"),
+        ("Счёт: 100", "Счёт: 250"),
+        ("ქულა 10", "ქულა 9"),
+        ("a漢字b", "abcdb"),
+        ("ab漢", "abc"),
+        ("漢字", "漢"),
+        ("x漢字", "xabc"),
+        ("", "漢字"),
+        ("[][]  ", "  [][]"),
+    ],
+)
+def test_line_update_rewrites_only_what_changed(old, new):
+    terminal = Terminal()
+    terminal.feed(game._line_update(0, None, old))
+    terminal.feed(game._line_update(0, old, new))
+    assert terminal.screen(1) == [new.rstrip()]
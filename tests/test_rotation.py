@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+import game
+
+DATA = Path(__file__).with_name("data")
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_version_1_replay_scores_as_recorded(engine):
+    # Recorded before SRS; four three-corner T-spins that SRS would call minis.
+    replay = game.load_replay(DATA / "classic_v1.rpl")
+    assert replay.options["ruleset"] == "classic"
+    result = game.run_replay(replay, engine=engine)
+    assert (result.score, result.lines, result.level, result.pieces) == (9601, 23, 3, 89)
+    assert result.reason == "game_over"
+
+
+def load(tetris, cells):
+    rows = [0] * tetris.height
+    for x, y in cells:
+        rows[y] |= 1 << x
+    tetris._load_rows(rows)
+
+
+def full_rows(*rows, holes=()):
+    return [(x, y) for y in rows for x in range(10) if (x, y) not in holes]
+
+
+def test_kick_lookup_covers_every_turn():
+    kicks = game.DEFAULT_RULESET.kicks
+    for key in "JLSTZ":
+        assert kicks[(key, 0, 1)] == game.SRS_KICKS[(0, 1)]
+        assert kicks[(key, 3, 0)] == game.SRS_KICKS[(3, 0)]
+        assert kicks[(key, 2, 0)] == game.SRS_HALF_TURN_KICKS[(2, 0)]
+    assert kicks[("I", 0, 1)] == game.SRS_I_KICKS[(0, 1)]
+    assert kicks[("I", 1, 3)] == game.SRS_HALF_TURN_KICKS[(1, 3)]
+    assert kicks[("O", 0, 0)][0] == (0, 0)
+    assert game.DEFAULT_RULESET.max_kick_rise == 2
+
+
+@pytest.mark.parametrize("table", [game.SRS_KICKS, game.SRS_I_KICKS])
+def test_quarter_turn_kicks_undo_each_other(table):
+    for (start, end), offsets in table.items():
+        assert table[(end, start)] == tuple((-dx, -dy) for dx, dy in offsets)
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+@pytest.mark.parametrize("key", list(game.SHAPES))
+def test_turns_come_back_to_the_start(engine, key):
+    tetris = game.Tetris({}, engine=engine, persist=False, seed=1)
+    tetris.shape_key, tetris.rotation, tetris.x, tetris.y = key, 0, 4, 10
+    for turn in (1, 1, 1, 1, -1, -1, -1, -1, 2, 2):
+        assert tetris.rotate(turn)
+    assert (tetris.rotation, tetris.x, tetris.y) == (0, 4, 10)
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_t_spin_triple_uses_the_far_kick(engine):
+    tetris = game.Tetris({}, engine=engine, persist=False, seed=1)
+    load(tetris, full_rows(17, 18, 19, holes={(4, 17), (3, 18), (4, 18), (4, 19)}) + [(4, 15)])
+    tetris.shape_key, tetris.rotation, tetris.x, tetris.y = "T", 0, 3, 16
+    assert tetris.rotate(-1)
+    assert (tetris.rotation, tetris.x, tetris.y, tetris.last_kick_far) == (3, 4, 18, True)
+    assert tetris.is_t_spin() == game.T_SPIN_FULL
+    tetris.lock_piece()
+    assert tetris.last_clear == (3, game.T_SPIN_FULL)
+    assert tetris.score == game.T_SPIN_SCORES[3]
+
+
+@pytest.mark.parametrize("ruleset, kind", [("standard", game.T_SPIN_MINI), ("classic", game.T_SPIN_FULL)])
+def test_mini_t_spin_needs_both_front_corners(ruleset, kind):
+    tetris = game.Tetris({"ruleset": ruleset}, persist=False, seed=1)
+    # Both back corners and one front corner filled around a T pointing up at (4, 18).
+    load(tetris, full_rows(18, holes={(3, 18), (4, 18), (5, 18)}) + [(3, 19), (5, 19), (3, 17)])
+    up = next(rot for rot, cells in enumerate(tetris.pieces["T"].rotations) if (0, -1) in cells and (0, 1) not in cells)
+    tetris.shape_key, tetris.rotation, tetris.x, tetris.y = "T", up, 4, 18
+    tetris.last_move_was_rotate = True
+    assert tetris.is_t_spin() == kind
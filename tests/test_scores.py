@@ -0,0 +1,77 @@
+import random
+import threading
+
+import pytest
+
+import game
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = game.SqliteScoreStore(tmp_path / "scores.db")
+    yield store
+    store.close()
+
+
+def brute_rank(store, score):
+    (higher,) = store.conn.execute("SELECT COUNT(*) FROM games WHERE score > ?", (score,)).fetchone()
+    return higher + 1
+
+
+def test_rank_matches_count(sqlite_store):
+    rng = random.Random(3)
+    scores = [rng.randrange(5000) for _ in range(300)]
+    scores += [rng.choice(scores) for _ in range(100)]  # ties
+    scores += [rng.randrange(2**62) for _ in range(50)] + [2**62 - 1, 2**62, 0]
+    sqlite_store.add_entries(("AAA", score, None, None, None, None, None) for score in scores)
+
+    probes = set(scores) | {score + 1 for score in scores} | {score - 1 for score in scores if score}
+    probes |= {0, 2**62 + 1, 2**63 - 1}
+    for score in sorted(probes):
+        assert sqlite_store.rank_of_score(score) == brute_rank(sqlite_store, score)
+
+
+def test_record_game_keeps_every_game(sqlite_store):
+    for score in range(1, 16):
+        sqlite_store.record_game("CPU", score * 100, seed=score)
+    (count,) = sqlite_store.conn.execute("SELECT COUNT(*) FROM games").fetchone()
+    assert count == 15
+    assert sqlite_store.rank_of_score(1000) == 6
+    assert len(sqlite_store.load()["leaderboard"]) == game.LEADERBOARD_LIMIT
+
+    game_id = sqlite_store.record_game("", 2000, seed=99)
+    assert sqlite_store.qualifies(2000)
+    sqlite_store.add_entry("xyz", 2000, game_id=game_id, seed=99)
+    assert sqlite_store.top_scores(1) == [("XYZ", 2000)]
+    assert sqlite_store.best_for_initials("XYZ")["seed"] == 99
+    (count,) = sqlite_store.conn.execute("SELECT COUNT(*) FROM games").fetchone()
+    assert count == 16
+
+
+def test_json_store_ignores_record_game(score_store):
+    assert score_store.record_game("CPU", 500, seed=1) is None
+    assert score_store.load()["leaderboard"] == []
+
+
+def test_new_database_opened_concurrently(tmp_path):
+    path = tmp_path / "scores.db"
+    errors = []
+
+    def open_store():
+        store = game.SqliteScoreStore(path)
+        try:
+            store.record_game("CPU", 100)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=open_store) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    store = game.SqliteScoreStore(path)
+    assert store.rank_of_score(99) == 9
+    store.close()
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+import game
+import server
+
+
+class FakeWriter:
+    transport = None
+
+    def __init__(self):
+        self.sent = []
+
+    def write(self, payload):
+        self.sent.append(payload)
+
+    def is_closing(self):
+        return False
+
+
+def start_match(engine):
+    hub = server.Hub(engine=engine, seed=0)
+    match, first = hub.join(FakeWriter())
+    _, second = hub.join(FakeWriter())
+    return hub, match, first, second
+
+
+def set_up_double(tetris):
+    # Fill the two bottom rows around a placement that covers both, so dropping it clears two lines.
+    full = (1 << tetris.width) - 1
+    for placement in tetris.enumerate_placements():
+        trial = tetris.clone()
+        for action in placement.path:
+            game.apply_action(trial, action)
+        low, bottom = trial.snapshot().rows[-2:]
+        if bottom and low & bottom == bottom:
+            state = tetris.snapshot()
+            tetris.restore(state._replace(rows=state.rows[:-2] + (full ^ low, full ^ bottom)))
+            return placement.path
+    raise AssertionError("no placement covers the two bottom rows")
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_cleared_lines_send_garbage(engine):
+    hub, match, first, second = start_match(engine)
+    first.inbox.extend(set_up_double(first.game))
+    hub.step()
+    assert first.game.last_clear[0] == 2
+    assert second.pending_garbage == server.GARBAGE_FOR_LINES[2]
+
+    # The next lock without a clear raises the garbage under the receiver's stack.
+    second.inbox.append("hard_drop")
+    hub.step()
+    assert second.pending_garbage == 0
+    assert second.game.snapshot().rows[-1] != 0
+
+
+def test_hold_and_rotations_are_accepted():
+    async def scenario():
+        hub = server.Hub(seed=0)
+        listener = await asyncio.start_server(hub.handle_client, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        connections = [await asyncio.open_connection("127.0.0.1", port) for _ in range(2)]
+        for _, writer in connections:
+            writer.write(server.encode({"op": "join"}))
+            await writer.drain()
+        for _ in range(100):
+            if hub.matches and hub.matches[0].running:
+                break
+            await asyncio.sleep(0.01)
+        players = hub.matches[0].players
+        for _, writer in connections:
+            for action in ("hold", "rotate_ccw", "rotate_180", "bogus"):
+                writer.write(server.encode({"op": "action", "action": action}))
+            await writer.drain()
+        for _ in range(100):
+            if all(len(player.inbox) == 3 for player in players):
+                break
+            await asyncio.sleep(0.01)
+        inboxes = [list(player.inbox) for player in players]
+        hub.step()
+        held = [player.game.held_piece for player in players]
+        for _, writer in connections:
+            writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return inboxes, held
+
+    inboxes, held = asyncio.run(scenario())
+    assert inboxes == [["hold", "rotate_ccw", "rotate_180"]] * 2
+    assert None not in held
+
+
+@pytest.mark.parametrize("matches", [2, 5])
+def test_loopback_matches_finish(matches):
+    hub, results, _ = asyncio.run(server.run_loopback(matches=matches, actions_per_second=200.0, timeout=20.0))
+    assert len(results) == matches * 2
+    assert all(stats["result"] is not None and stats["result"]["type"] == "over" for stats in results)
+    assert hub.finished_matches == matches
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+import game
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_restore_resumes_the_same_game(play_random, engine):
+    tetris, snapshots = play_random(engine, 7, steps=300)
+    other = game.Tetris({}, engine=engine, persist=False, seed=99)
+    middle = snapshots[len(snapshots) // 2]
+    other.restore(middle)
+    tetris.restore(middle)
+    rng = random.Random(7)
+    for _ in range(200):
+        action = rng.choice(game.REPLAY_ACTIONS)
+        game.apply_action(tetris, action)
+        game.apply_action(other, action)
+        assert other.snapshot() == tetris.snapshot()
+
+
+@pytest.mark.parametrize("engine", sorted(game.ENGINES))
+def test_clone_plays_on_without_touching_the_original(play_random, engine):
+    tetris, _ = play_random(engine, 4, steps=150)
+    before = tetris.snapshot()
+    clone = tetris.clone()
+    assert clone.snapshot() == before
+    assert not clone.persist
+
+    rng = random.Random(4)
+    actions = [rng.choice(game.REPLAY_ACTIONS) for _ in range(300)]
+    for action in actions:
+        game.apply_action(clone, action)
+    assert tetris.snapshot() == before
+
+    # The original then plays out exactly as the clone did.
+    for action in actions:
+        game.apply_action(tetris, action)
+    assert tetris.snapshot() == clone.snapshot()
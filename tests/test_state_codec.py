@@ -0,0 +1,32 @@
+import pytest
+
+import game
+
+
+@pytest.mark.parametrize("ruleset", ["standard", "pentomino", "wide"])
+def test_full_states_round_trip(play_random, ruleset):
+    tetris, snapshots = play_random("bitboard", 3, ruleset)
+    for state in snapshots:
+        assert game.decode_state(game.encode_state(state, tetris.ruleset), ruleset=tetris.ruleset) == state
+
+
+@pytest.mark.parametrize("ruleset", ["standard", "pentomino"])
+def test_deltas_rebuild_the_stream(play_random, ruleset):
+    tetris, snapshots = play_random("grid", 5, ruleset)
+    previous = snapshots[0]
+    for state in snapshots[1:]:
+        data = game.encode_state_delta(previous, state, tetris.ruleset)
+        previous = game.decode_state(data, previous, ruleset=tetris.ruleset)
+        assert previous == state
+
+
+def test_delta_without_previous_state_is_rejected():
+    state = game.Tetris({}, persist=False, seed=1).snapshot()
+    with pytest.raises(ValueError):
+        game.decode_state(game.encode_state_delta(state, state))
+
+
+def test_to_bytes_and_from_bytes(play_random):
+    tetris, _ = play_random("grid", 8, steps=200)
+    copy = game.Tetris.from_bytes(tetris.to_bytes(), engine="bitboard")
+    assert copy.snapshot() == tetris.snapshot()